@@ -1,6 +1,7 @@
 """
 Standalone test runner — no pytest needed.
-Run: python3 run_tests.py
+Run: python3 run_tests.py            (tests run in a process pool)
+     python3 run_tests.py --serial   (in-process, for debugging)
 
 Covers basic pre-registry tests: SQLite introspection, schema comparison,
 type normalization, severity roll-up, and pure STRUCT drift detection.
@@ -12,48 +13,115 @@ Domain-specific tests live in:
   tests/postgresql_tests.py  — PostgreSQL reader + checker (mocked psycopg2)
 """
 
+import compileall
+import functools
+import io
+import os
 import sys
 import traceback
 import sqlite3
-import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import dataclass
 from pathlib import Path
 
-# Make tools importable
-sys.path.insert(0, str(Path(__file__).parent))
+_ROOT = Path(__file__).parent
 
-from shelfard import (
-    ColumnSchema, TableSchema, ColumnType, ChangeSeverity, ChangeType,
-    get_sqlite_schema, compare_schemas,
-)
+
+def _import_tools():
+    """Import shelfard into module globals; run in main() and in each pool worker."""
+    global ColumnSchema, TableSchema, ColumnType, ChangeSeverity, ChangeType
+    global get_sqlite_schema, compare_schemas, SQLiteReader
+    if str(_ROOT) not in sys.path:
+        sys.path.insert(0, str(_ROOT))
+    from shelfard import (
+        ColumnSchema, TableSchema, ColumnType, ChangeSeverity, ChangeType,
+        get_sqlite_schema, compare_schemas, SQLiteReader,
+    )
 
 # ─────────────────────────────────────────────
 # Minimal test framework
 # ─────────────────────────────────────────────
+# test() only registers; main() runs everything. Tests are independent, so
+# they are fanned out over a process pool and reported in registration order.
+
+_REGISTRY = []
+_current_section = None
 
-passed = 0
-failed = 0
-errors = []
+
+@dataclass
+class TestResult:
+    section: str
+    name: str
+    status: str        # "pass" | "fail" | "error"
+    detail: str | BaseException = ""   # assertion message, traceback, or unformatted exception
+    output: str = ""   # anything the test printed
 
 def test(name, fn):
-    global passed, failed
+    _REGISTRY.append((_current_section, name, fn))
+
+def section(name):
+    global _current_section
+    _current_section = name
+
+def _run_one(entry):
+    section_name, name, fn = entry
+    out = io.StringIO()
     try:
-        fn()
-        print(f"  ✓ {name}")
-        passed += 1
+        with redirect_stdout(out):
+            fn()
+        return TestResult(section_name, name, "pass", output=out.getvalue())
     except AssertionError as e:
-        print(f"  ✗ {name}")
-        errors.append((name, str(e)))
-        failed += 1
+        return TestResult(section_name, name, "fail", str(e), out.getvalue())
     except Exception as e:
-        print(f"  ✗ {name} [ERROR]")
-        errors.append((name, traceback.format_exc()))
-        failed += 1
+        # Keep the exception; its traceback is only formatted if it gets reported.
+        return TestResult(section_name, name, "error", e, out.getvalue())
 
-def section(name):
-    print(f"\n── {name} ──")
+def _run_one_in_worker(entry):
+    # Tracebacks do not pickle, so pool workers format them before returning.
+    result = _run_one(entry)
+    result.detail = _format_detail(result.detail)
+    return result
+
+def _format_detail(detail):
+    if isinstance(detail, BaseException):
+        return "".join(traceback.format_exception(detail))
+    return detail
+
+# Fixture schemas are read-only inside tests, so identical ones are shared.
+_SCHEMA_CACHE: dict[tuple, "TableSchema"] = {}
+
+def _column_key(c):
+    fields = tuple(_column_key(f) for f in c.fields) if c.fields is not None else None
+    return (c.name, c.col_type, c.nullable, c.max_length, c.default_value,
+            c.precision, c.scale, c.description, fields)
 
 def make_schema(table_name, columns):
-    return TableSchema(table_name=table_name, columns=columns, source="test")
+    key = (table_name, tuple(_column_key(c) for c in columns))
+    schema = _SCHEMA_CACHE.get(key)
+    if schema is None:
+        schema = _SCHEMA_CACHE[key] = TableSchema(table_name=table_name, columns=columns, source="test")
+    return schema
+
+def _open_sqlite(db_path):
+    """Open a scratch SQLite database in autocommit mode with fsync-light pragmas."""
+    conn = sqlite3.connect(db_path, isolation_level=None, uri=True)
+    conn.executescript(
+        "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA temp_store=MEMORY; "
+        "PRAGMA mmap_size=268435456; PRAGMA cache_size=-16384;"
+    )
+    return conn
+
+# One shared-cache in-memory database per process; tests drop their tables before recreating them.
+_SHARED_DB = "file:shelfard_tests?mode=memory&cache=shared"
+_shared_conn_state = None   # (pid, connection)
+
+def _shared_conn():
+    """Open-once connection that keeps _SHARED_DB alive for the lifetime of the process."""
+    global _shared_conn_state
+    if _shared_conn_state is None or _shared_conn_state[0] != os.getpid():
+        _shared_conn_state = (os.getpid(), _open_sqlite(_SHARED_DB))
+    return _shared_conn_state[1]
 
 
 # ─────────────────────────────────────────────
@@ -63,35 +131,31 @@ def make_schema(table_name, columns):
 section("SQLite Introspection")
 
 def test_basic_introspection():
-    with tempfile.TemporaryDirectory() as tmp:
-        db = f"{tmp}/test.db"
-        conn = sqlite3.connect(db)
-        conn.execute("CREATE TABLE users (id INTEGER NOT NULL, email VARCHAR(255), age INTEGER)")
-        conn.commit(); conn.close()
-        result = get_sqlite_schema(db, "users")
-        assert result.success, result.error
-        schema = result.data["schema"]
-        assert schema["table_name"] == "users"
-        assert len(schema["columns"]) == 3
-        assert schema["columns"][0]["name"] == "id"
+    conn = _shared_conn()
+    conn.execute("DROP TABLE IF EXISTS users")
+    conn.execute("CREATE TABLE users (id INTEGER NOT NULL, email VARCHAR(255), age INTEGER)")
+    result = get_sqlite_schema(_SHARED_DB, "users")
+    assert result.success, result.error
+    schema = result.data["schema"]
+    assert schema["table_name"] == "users"
+    assert len(schema["columns"]) == 3
+    assert schema["columns"][0]["name"] == "id"
 
 test("basic table introspection", test_basic_introspection)
 
 def test_type_normalization():
-    with tempfile.TemporaryDirectory() as tmp:
-        db = f"{tmp}/test.db"
-        conn = sqlite3.connect(db)
-        conn.execute("CREATE TABLE t (a INTEGER, b REAL, c TEXT, d BOOLEAN, e TIMESTAMP, f NUMERIC)")
-        conn.commit(); conn.close()
-        result = get_sqlite_schema(db, "t")
-        assert result.success
-        types = {c["name"]: c["col_type"] for c in result.data["schema"]["columns"]}
-        assert types["a"] == "integer"
-        assert types["b"] == "float"
-        assert types["c"] == "text"
-        assert types["d"] == "boolean"
-        assert types["e"] == "timestamp"
-        assert types["f"] == "decimal"
+    conn = _shared_conn()
+    conn.execute("DROP TABLE IF EXISTS t")
+    conn.execute("CREATE TABLE t (a INTEGER, b REAL, c TEXT, d BOOLEAN, e TIMESTAMP, f NUMERIC)")
+    result = get_sqlite_schema(_SHARED_DB, "t")
+    assert result.success
+    types = {c["name"]: c["col_type"] for c in result.data["schema"]["columns"]}
+    assert types["a"] == "integer"
+    assert types["b"] == "float"
+    assert types["c"] == "text"
+    assert types["d"] == "boolean"
+    assert types["e"] == "timestamp"
+    assert types["f"] == "decimal"
 
 test("type normalization", test_type_normalization)
 
@@ -103,30 +167,47 @@ def test_nonexistent_db():
 test("nonexistent db returns error", test_nonexistent_db)
 
 def test_nonexistent_table():
-    with tempfile.TemporaryDirectory() as tmp:
-        db = f"{tmp}/test.db"
-        conn = sqlite3.connect(db)
-        conn.execute("CREATE TABLE real_table (id INTEGER)")
-        conn.commit(); conn.close()
-        result = get_sqlite_schema(db, "ghost_table")
-        assert not result.success
-        assert result.next_action_hint is not None
+    conn = _shared_conn()
+    conn.execute("DROP TABLE IF EXISTS real_table")
+    conn.execute("CREATE TABLE real_table (id INTEGER)")
+    result = get_sqlite_schema(_SHARED_DB, "ghost_table")
+    assert not result.success
+    assert result.next_action_hint is not None
 
 test("nonexistent table returns error with hint", test_nonexistent_table)
 
 def test_varchar_length_captured():
-    with tempfile.TemporaryDirectory() as tmp:
-        db = f"{tmp}/test.db"
-        conn = sqlite3.connect(db)
-        conn.execute("CREATE TABLE t (name VARCHAR(100))")
-        conn.commit(); conn.close()
-        result = get_sqlite_schema(db, "t")
-        assert result.success
-        col = result.data["schema"]["columns"][0]
-        assert col["max_length"] == 100
+    conn = _shared_conn()
+    conn.execute("DROP TABLE IF EXISTS t")
+    conn.execute("CREATE TABLE t (name VARCHAR(100))")
+    result = get_sqlite_schema(_SHARED_DB, "t")
+    assert result.success
+    col = result.data["schema"]["columns"][0]
+    assert col["max_length"] == 100
 
 test("varchar length is captured", test_varchar_length_captured)
 
+def test_reader_reuses_read_only_connection():
+    conn = _shared_conn()
+    conn.execute("DROP TABLE IF EXISTS reused")
+    conn.execute("CREATE TABLE reused (id INTEGER)")
+    with SQLiteReader(_SHARED_DB, "reused") as reader:
+        assert reader.get_schema().success
+        cached = reader._conn
+        conn.execute("ALTER TABLE reused ADD COLUMN note TEXT")
+        result = reader.get_schema()
+        assert reader._conn is cached
+        assert [c["name"] for c in result.data["schema"]["columns"]] == ["id", "note"]
+        assert "reused" in reader.list_tables().data["tables"]
+        try:
+            cached.execute("CREATE TABLE sneaky (x INTEGER)")
+            raise AssertionError("reader connection accepted a write")
+        except sqlite3.OperationalError:
+            pass
+    assert reader._conn is None
+
+test("reader reuses one read-only connection across calls", test_reader_reuses_read_only_connection)
+
 
 section("Schema Comparison — No Changes")
 
@@ -149,6 +230,7 @@ test("identical schemas produce no changes", test_identical_schemas)
 
 section("Schema Comparison — Column Additions")
 
+@functools.lru_cache(maxsize=None)
 def make_orders_v1():
     return make_schema("orders", [
         ColumnSchema("order_id",    ColumnType.INTEGER,   nullable=False),
@@ -210,76 +292,35 @@ def test_removal_always_breaking():
     new = TableSchema(table_name="orders", columns=new_cols, source="test")
     result = compare_schemas(old, new)
     diff = result.data["diff"]
-    removed = [c for c in diff["changes"] if c["change_type"] == ChangeType.COLUMN_REMOVED]
+    removed = diff["changes_by_type"][ChangeType.COLUMN_REMOVED.value]
     assert len(removed) == 1
     assert removed[0]["severity"] == ChangeSeverity.BREAKING
 
 test("column removal is always BREAKING", test_removal_always_breaking)
 
 
-section("Schema Comparison — Type Changes")
-
-def test_int_to_bigint_safe():
-    old = make_schema("t", [ColumnSchema("id", ColumnType.INTEGER)])
-    new = make_schema("t", [ColumnSchema("id", ColumnType.BIGINT)])
-    diff = compare_schemas(old, new).data["diff"]
-    assert diff["changes"][0]["change_type"] == ChangeType.TYPE_WIDENED
-    assert diff["changes"][0]["severity"] == ChangeSeverity.SAFE
-
-test("integer → bigint is SAFE widening", test_int_to_bigint_safe)
-
-def test_varchar_widening_safe():
-    old = make_schema("t", [ColumnSchema("name", ColumnType.VARCHAR, max_length=50)])
-    new = make_schema("t", [ColumnSchema("name", ColumnType.VARCHAR, max_length=200)])
-    diff = compare_schemas(old, new).data["diff"]
-    assert diff["changes"][0]["severity"] == ChangeSeverity.SAFE
-
-test("varchar(50) → varchar(200) is SAFE", test_varchar_widening_safe)
-
-def test_varchar_narrowing_breaking():
-    old = make_schema("t", [ColumnSchema("code", ColumnType.VARCHAR, max_length=100)])
-    new = make_schema("t", [ColumnSchema("code", ColumnType.VARCHAR, max_length=10)])
-    diff = compare_schemas(old, new).data["diff"]
-    assert diff["changes"][0]["severity"] == ChangeSeverity.BREAKING
+section("Schema Comparison — Type & Nullability Changes")
 
-test("varchar(100) → varchar(10) is BREAKING", test_varchar_narrowing_breaking)
-
-def test_integer_to_varchar_breaking():
-    old = make_schema("t", [ColumnSchema("amount", ColumnType.INTEGER)])
-    new = make_schema("t", [ColumnSchema("amount", ColumnType.VARCHAR)])
-    diff = compare_schemas(old, new).data["diff"]
-    assert diff["changes"][0]["severity"] == ChangeSeverity.BREAKING
-
-test("integer → varchar is BREAKING", test_integer_to_varchar_breaking)
-
-def test_varchar_to_text_safe():
-    old = make_schema("t", [ColumnSchema("notes", ColumnType.VARCHAR, max_length=500)])
-    new = make_schema("t", [ColumnSchema("notes", ColumnType.TEXT)])
-    diff = compare_schemas(old, new).data["diff"]
-    assert diff["changes"][0]["severity"] == ChangeSeverity.SAFE
-
-test("varchar → text is SAFE", test_varchar_to_text_safe)
-
-
-section("Schema Comparison — Nullability")
-
-def test_not_null_to_nullable_safe():
-    old = make_schema("t", [ColumnSchema("code", ColumnType.VARCHAR, nullable=False)])
-    new = make_schema("t", [ColumnSchema("code", ColumnType.VARCHAR, nullable=True)])
-    diff = compare_schemas(old, new).data["diff"]
-    assert diff["changes"][0]["change_type"] == ChangeType.NULLABILITY_RELAXED
-    assert diff["changes"][0]["severity"] == ChangeSeverity.SAFE
-
-test("NOT NULL → NULL is SAFE (relaxed)", test_not_null_to_nullable_safe)
-
-def test_nullable_to_not_null_breaking():
-    old = make_schema("t", [ColumnSchema("code", ColumnType.VARCHAR, nullable=True)])
-    new = make_schema("t", [ColumnSchema("code", ColumnType.VARCHAR, nullable=False)])
-    diff = compare_schemas(old, new).data["diff"]
-    assert diff["changes"][0]["change_type"] == ChangeType.NULLABILITY_TIGHTENED
-    assert diff["changes"][0]["severity"] == ChangeSeverity.BREAKING
+def test_type_matrix():
+    # (old_type, old_kwargs, new_type, new_kwargs, expected_change, expected_severity)
+    CASES = [
+        (ColumnType.INTEGER, {},                  ColumnType.BIGINT,  {},                 ChangeType.TYPE_WIDENED,          ChangeSeverity.SAFE),
+        (ColumnType.VARCHAR, {"max_length": 50},  ColumnType.VARCHAR, {"max_length": 200}, ChangeType.TYPE_WIDENED,          ChangeSeverity.SAFE),
+        (ColumnType.VARCHAR, {"max_length": 100}, ColumnType.VARCHAR, {"max_length": 10},  ChangeType.TYPE_CHANGED,          ChangeSeverity.BREAKING),
+        (ColumnType.INTEGER, {},                  ColumnType.VARCHAR, {},                 ChangeType.TYPE_CHANGED,          ChangeSeverity.BREAKING),
+        (ColumnType.VARCHAR, {"max_length": 500}, ColumnType.TEXT,    {},                 ChangeType.TYPE_WIDENED,          ChangeSeverity.SAFE),
+        (ColumnType.VARCHAR, {"nullable": False}, ColumnType.VARCHAR, {"nullable": True},  ChangeType.NULLABILITY_RELAXED,   ChangeSeverity.SAFE),
+        (ColumnType.VARCHAR, {"nullable": True},  ColumnType.VARCHAR, {"nullable": False}, ChangeType.NULLABILITY_TIGHTENED, ChangeSeverity.BREAKING),
+    ]
+    for ot, ok, nt, nk, expected_change, expected_severity in CASES:
+        old = make_schema("t", [ColumnSchema("x", ot, **ok)])
+        new = make_schema("t", [ColumnSchema("x", nt, **nk)])
+        change = compare_schemas(old, new).data["diff"]["changes"][0]
+        case = f"{ot.value}{ok} → {nt.value}{nk}"
+        assert change["change_type"] == expected_change, f"{case}: got {change['change_type']}"
+        assert change["severity"] == expected_severity, f"{case}: got {change['severity']}"
 
-test("NULL → NOT NULL is BREAKING (tightened)", test_nullable_to_not_null_breaking)
+test("type matrix: widening, narrowing, incompatible and nullability changes", test_type_matrix)
 
 
 section("Schema Comparison — Reordering & Defaults")
@@ -296,7 +337,7 @@ def test_reorder_is_warning():
         ColumnSchema("b", ColumnType.INTEGER),
     ])
     diff = compare_schemas(old, new).data["diff"]
-    reorders = [c for c in diff["changes"] if c["change_type"] == ChangeType.COLUMN_REORDERED]
+    reorders = diff["changes_by_type"][ChangeType.COLUMN_REORDERED.value]
     assert len(reorders) == 1
     assert reorders[0]["severity"] == ChangeSeverity.WARNING
     assert "positional" in reorders[0]["reasoning"].lower()
@@ -352,9 +393,9 @@ def test_saas_schema_update():
     diff = result.data["diff"]
     assert diff["overall_severity"] == ChangeSeverity.BREAKING
 
-    removed = [c for c in diff["changes"] if c["change_type"] == ChangeType.COLUMN_REMOVED]
-    added   = [c for c in diff["changes"] if c["change_type"] == ChangeType.COLUMN_ADDED]
-    widened = [c for c in diff["changes"] if c["change_type"] == ChangeType.TYPE_WIDENED]
+    removed = diff["changes_by_type"][ChangeType.COLUMN_REMOVED.value]
+    added   = diff["changes_by_type"][ChangeType.COLUMN_ADDED.value]
+    widened = diff["changes_by_type"][ChangeType.TYPE_WIDENED.value]
 
     assert any(c["column_name"] == "sub_id" for c in removed)
     assert any(c["column_name"] == "subscription_id" for c in added)
@@ -417,7 +458,7 @@ def test_json_to_struct_is_breaking():
     ], source="test")
     diff = compare_schemas(old, new).data["diff"]
     assert diff["overall_severity"] == ChangeSeverity.BREAKING
-    assert any(c["change_type"] == ChangeType.TYPE_CHANGED for c in diff["changes"])
+    assert ChangeType.TYPE_CHANGED.value in diff["changes_by_type"]
 
 test("JSON → STRUCT is a BREAKING type change", test_json_to_struct_is_breaking)
 
@@ -448,16 +489,51 @@ test("3-level nested drift uses fully qualified name 'user.address.zip'", test_q
 # Results
 # ─────────────────────────────────────────────
 
-total = passed + failed
-print(f"\n{'='*50}")
-print(f"Results: {passed}/{total} passed", end="")
-if failed:
-    print(f"  ({failed} failed)")
-    print("\nFailures:")
-    for name, err in errors:
-        print(f"\n  ✗ {name}")
-        print(f"    {err}")
-else:
-    print(" ✓")
-print('='*50)
-sys.exit(0 if failed == 0 else 1)
+def main():
+    # Byte-compile once up front so pool workers load shelfard from .pyc.
+    compileall.compile_dir(_ROOT / "shelfard", quiet=1)
+    _import_tools()
+    if "--serial" in sys.argv[1:]:
+        results = [_run_one(entry) for entry in _REGISTRY]
+    else:
+        with ProcessPoolExecutor(initializer=_import_tools) as ex:
+            results = list(ex.map(_run_one_in_worker, _REGISTRY))
+
+    passed = 0
+    errors = []
+    current_section = None
+    # Collect each section's lines and emit them with a single write.
+    pending = []
+    for r in results:
+        if r.section != current_section:
+            sys.stdout.write("".join(pending))
+            pending.clear()
+            current_section = r.section
+            pending.append(f"\n── {current_section} ──\n")
+        pending.append(r.output)
+        if r.status == "pass":
+            pending.append(f"  ✓ {r.name}\n")
+            passed += 1
+        else:
+            pending.append(f"  ✗ {r.name}" + (" [ERROR]" if r.status == "error" else "") + "\n")
+            errors.append((r.name, r.detail))
+    sys.stdout.write("".join(pending))
+
+    failed = len(errors)
+    total = passed + failed
+    print(f"\n{'='*50}")
+    print(f"Results: {passed}/{total} passed", end="")
+    if failed:
+        print(f"  ({failed} failed)")
+        print("\nFailures:")
+        for name, err in errors:
+            print(f"\n  ✗ {name}")
+            print(f"    {_format_detail(err)}")
+    else:
+        print(" ✓")
+    print('='*50)
+    sys.exit(0 if failed == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,13 +6,16 @@ from .models import (
 from .tools import (
     SchemaReader, Checker,
     SQLiteReader, get_sqlite_schema, list_sqlite_tables,
-    RestEndpointReader, get_rest_schema, RestChecker,
+    RestEndpointReader, get_rest_schema, get_rest_schemas, RestChecker,
     PostgresReader, get_postgres_schema, list_postgres_tables, PostgresChecker,
 )
-from .parsers import get_schema_from_json, infer_schema_from_json_file, read_and_register_json_file
+from .parsers import (
+    get_schema_from_json,
+    infer_schema_from_json_file, infer_schema_from_json_bytes, read_and_register_json_file,
+)
 from .registry import (
     SchemaRegistry, LocalFileRegistry, S3Registry, GCSRegistry, SQLRegistry,
-    register_schema, get_registered_schema, get_all_schemas,
+    register_schema, register_schemas, get_registered_schema, get_all_schemas,
     subscribe_consumer, get_consumer_subscription,
     get_consumers_for_table, get_all_consumers,
     get_consumers_affected_by_diff,
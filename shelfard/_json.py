@@ -0,0 +1,178 @@
+"""
+Internal JSON codec.
+
+Uses orjson when it is installed (pip install shelfard[speedups]) and falls
+back to the stdlib json module otherwise. loads() accepts bytes or str, so
+callers can hand it raw HTTP bodies or file contents without decoding first.
+dumps() always returns 2-space-indented str, matching json.dumps(indent=2).
+"""
+
+import codecs
+import json
+import re
+from typing import Iterable
+
+try:
+    import orjson
+except ImportError:   # optional dependency
+    orjson = None
+
+
+# orjson.JSONDecodeError subclasses this, so catching it covers both backends.
+JSONDecodeError = json.JSONDecodeError
+
+loads = orjson.loads if orjson is not None else json.loads
+
+if orjson is not None:
+    _DUMPS_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(obj, default=None) -> str:
+    """
+    Serialize obj as indented JSON text.
+
+    default is called for objects neither backend handles natively, as with
+    json.dumps. Anything orjson refuses outright (e.g. integers wider than
+    64 bits) is retried with the stdlib encoder.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default, option=_DUMPS_OPTS).decode()
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(obj, indent=2, default=default)
+
+
+_DECODER = json.JSONDecoder()
+_WS_RE = re.compile(r"[ \t\n\r]*")
+_WS_BYTES_RE = re.compile(rb"[ \t\n\r]*")
+
+
+class _ArrayHead:
+    """
+    Incremental decoder for the first n elements of a top-level array.
+
+    feed() takes the text after the opening '[' piece by piece. Decoded
+    elements and the offset of the next one are kept between calls, so each
+    call only works on the element that was still incomplete, and text
+    already consumed is dropped.
+    """
+
+    def __init__(self, n: int) -> None:
+        self.n = n
+        self.items: list = []
+        self._parts: list[str] = []     # unconsumed text, joined only when decoding
+        self._size = 0
+        self._first = True
+        # After a failed decode, wait for the buffer to double before retrying,
+        # so an element spanning many chunks is rescanned only O(log) times.
+        self._retry_len = 0
+
+    def feed(self, more: str, final: bool = False) -> bool:
+        """Append text; True once n elements or the closing ']' were read."""
+        self._parts.append(more)
+        self._size += len(more)
+        if not final and self._size < self._retry_len:
+            return False
+        text = "".join(self._parts)
+        items = self.items
+        pos = 0
+        retry_len = 0
+        try:
+            while True:
+                j = _WS_RE.match(text, pos).end()
+                if self._first and text.startswith("]", j):
+                    return True
+                if j == len(text) and not final:
+                    break
+                value, end = _DECODER.raw_decode(text, j)
+                # A number cut at a chunk boundary ("12" of "125", "0" of "0.5")
+                # decodes "successfully" as a prefix of itself, so a value only
+                # counts once the ',' or ']' after it has arrived.
+                k = _WS_RE.match(text, end).end()
+                if k == len(text) and not final:
+                    break
+                if text.startswith("]", k):
+                    items.append(value)
+                    return True
+                if not text.startswith(",", k):
+                    raise JSONDecodeError("Expecting ',' delimiter", text, k)
+                items.append(value)
+                if len(items) >= self.n:
+                    return True
+                self._first = False
+                pos = k + 1
+        except JSONDecodeError:
+            if final:
+                raise
+            retry_len = 2 * (len(text) - pos)
+        rest = text[pos:]
+        self._parts = [rest]
+        self._size = len(rest)
+        self._retry_len = retry_len
+        return False
+
+
+def loads_head(data: bytes | str, n: int = 1):
+    """
+    Like loads(), but a top-level array is cut short after its first n elements.
+
+    Returns a list of at most n elements for arrays and the fully decoded value
+    for anything else. Schema inference only samples the leading records, so
+    the rest of a large array is never scanned or materialised.
+    """
+    if isinstance(data, (bytes, bytearray)):
+        # Sniff the first byte; only an array body is decoded to str here.
+        i = _WS_BYTES_RE.match(data).end()
+        if data[i:i + 1] != b"[":
+            return loads(data)
+        text = data[i + 1:].decode("utf-8")
+    else:
+        i = _WS_RE.match(data).end()
+        if not data.startswith("[", i):
+            return loads(data)
+        text = data[i + 1:]
+    head = _ArrayHead(n)
+    head.feed(text, final=True)
+    return head.items
+
+
+def loads_head_iter(chunks: Iterable[bytes], n: int = 1):
+    """
+    loads_head() over a stream of byte chunks (e.g. an HTTP body).
+
+    For a top-level array, stops consuming chunks as soon as the first n
+    elements decode, so only that prefix of the body is ever held in memory.
+    Any other document is read to the end and decoded with loads().
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    raw: list[bytes] = []
+    prefix = ""
+    head: _ArrayHead | None = None
+    is_array = None
+    for chunk in chunks:
+        if is_array is False:
+            raw.append(chunk)
+            continue
+        text = decoder.decode(chunk)
+        if is_array is None:
+            raw.append(chunk)
+            prefix += text
+            i = _WS_RE.match(prefix).end()
+            if i == len(prefix):
+                continue                    # only whitespace so far
+            is_array = prefix[i] == "["
+            if not is_array:
+                continue
+            raw.clear()
+            head = _ArrayHead(n)
+            text = prefix[i + 1:]
+        if head.feed(text):
+            return head.items
+    if is_array:
+        # raises if the body really is malformed
+        head.feed(decoder.decode(b"", final=True), final=True)
+        return head.items
+    # Non-array bodies are parsed from the raw bytes; the decoder may still hold
+    # a partial character from the first chunk and is not consulted again.
+    return loads(b"".join(raw))
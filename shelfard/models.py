@@ -8,8 +8,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field, asdict
 from enum import Enum
+from functools import cached_property
 from typing import Optional
-import json
+
+from . import _json
 
 
 # ─────────────────────────────────────────────
@@ -33,7 +35,11 @@ class ColumnType(str, Enum):
     UNKNOWN   = "unknown"
 
 
-@dataclass
+# value → member; from_dict() resolves col_type strings with one dict lookup.
+_COLTYPE_LOOKUP: dict[str, ColumnType] = {m.value: m for m in ColumnType}
+
+
+@dataclass(frozen=True, slots=True)
 class ColumnSchema:
     name: str
     col_type: ColumnType
@@ -44,30 +50,64 @@ class ColumnSchema:
     default_value: Optional[str] = None
     description: Optional[str] = None
     fields: Optional[list[ColumnSchema]] = field(default=None)  # sub-fields for STRUCT columns
+    # Equality key, computed once in __post_init__ (see below).
+    signature: tuple = field(init=False, repr=False, compare=False)
+    # Diff key, built on first _fingerprint() call.
+    _fp: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Everything __eq__ looks at, as one tuple. Nested fields contribute their
+        # own precomputed signatures, so building it is O(own fields), and equality
+        # or hashing is a single C-level tuple compare instead of a recursive walk.
+        nested = tuple(f.signature for f in self.fields) if self.fields is not None else None
+        object.__setattr__(self, "signature", (
+            self.col_type, self.nullable, self.max_length, self.precision, self.scale, nested,
+        ))
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Built by hand: asdict() deep-copies every value, which dominates on wide schemas.
+        # Enums are emitted as their .value so the result is plain JSON.
+        return {
+            "name": self.name,
+            "col_type": self.col_type.value,
+            "nullable": self.nullable,
+            "max_length": self.max_length,
+            "precision": self.precision,
+            "scale": self.scale,
+            "default_value": self.default_value,
+            "description": self.description,
+            "fields": [f.to_dict() for f in self.fields] if self.fields is not None else None,
+        }
+
+    def _fingerprint(self) -> tuple:
+        """
+        Everything the schema diff inspects, names and defaults included at
+        every nesting level. Equal fingerprints mean the diff finds no change.
+        """
+        fp = self._fp
+        if fp is None:
+            nested = tuple(f._fingerprint() for f in self.fields) if self.fields is not None else None
+            fp = (self.name, self.default_value, self.signature, nested)
+            object.__setattr__(self, "_fp", fp)
+        return fp
 
     def __eq__(self, other):
         if not isinstance(other, ColumnSchema):
             return False
-        return (
-            self.col_type == other.col_type and
-            self.nullable == other.nullable and
-            self.max_length == other.max_length and
-            self.precision == other.precision and
-            self.scale == other.scale and
-            self.fields == other.fields
-        )
+        return self.signature == other.signature
+
+    def __hash__(self):
+        # Must agree with __eq__: name, default and description do not participate.
+        return hash(self.signature)
 
     @classmethod
     def from_dict(cls, col: dict) -> ColumnSchema:
         """Recursively reconstruct a ColumnSchema (and its nested fields) from a dict."""
         col_type_str = col.get("col_type", "unknown")
-        try:
-            col_type = ColumnType(col_type_str.lower())
-        except ValueError:
-            col_type = ColumnType.UNKNOWN
+        # Serialized schemas are already lowercase; only fall back to lower() on a miss.
+        col_type = _COLTYPE_LOOKUP.get(col_type_str) or _COLTYPE_LOOKUP.get(
+            col_type_str.lower(), ColumnType.UNKNOWN
+        )
 
         nested = None
         if col_type == ColumnType.STRUCT and col.get("fields"):
@@ -95,14 +135,25 @@ class TableSchema:
     source: str = "unknown"          # "sqlite", "snowflake", "bigquery", etc.
     captured_at: Optional[str] = None
 
+    @cached_property
     def column_map(self) -> dict[str, ColumnSchema]:
+        # Built once on first access. Schemas are treated as immutable
+        # snapshots; replace the whole TableSchema rather than mutating
+        # `columns` after the map has been read.
         return {col.name: col for col in self.columns}
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "table_name": self.table_name,
+            "columns": [c.to_dict() for c in self.columns],
+            "partition_keys": list(self.partition_keys),
+            "clustering_keys": list(self.clustering_keys),
+            "source": self.source,
+            "captured_at": self.captured_at,
+        }
 
     def to_json(self) -> str:
-        return json.dumps(self.to_dict(), indent=2, default=str)
+        return _json.dumps(self.to_dict())
 
 
 @dataclass
@@ -122,7 +173,16 @@ class ConsumerSubscription:
     source_schema_version: str                 # captured_at of source at subscription time
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "consumer_name": self.consumer_name,
+            "source_table": self.source_table,
+            "subscribed_columns": (
+                list(self.subscribed_columns) if self.subscribed_columns is not None else None
+            ),
+            "schema": self.schema.to_dict(),
+            "subscribed_at": self.subscribed_at,
+            "source_schema_version": self.source_schema_version,
+        }
 
     @classmethod
     def from_dict(cls, d: dict) -> ConsumerSubscription:
@@ -166,7 +226,7 @@ class ChangeType(str, Enum):
     COLUMN_REORDERED    = "column_reordered"   # safe for named access, breaking for positional
 
 
-@dataclass
+@dataclass(slots=True)
 class ColumnChange:
     change_type: ChangeType
     column_name: str
@@ -176,7 +236,15 @@ class ColumnChange:
     reasoning: str = ""                 # human-readable explanation of severity decision
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        # old_value/new_value are built fresh per change, so they are passed through uncopied.
+        return {
+            "change_type": self.change_type.value,
+            "column_name": self.column_name,
+            "old_value": self.old_value,
+            "new_value": self.new_value,
+            "severity": self.severity.value,
+            "reasoning": self.reasoning,
+        }
 
 
 @dataclass
@@ -201,10 +269,24 @@ class SchemaDiff:
         return [c for c in self.changes if c.severity == ChangeSeverity.SAFE]
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        changes = [c.to_dict() for c in self.changes]
+        # Index the serialized changes by type so consumers can skip rescanning the list.
+        # Keys are ChangeType values, matching the serialized "change_type" field.
+        by_type: dict[str, list[dict]] = {}
+        for c in changes:
+            by_type.setdefault(c["change_type"], []).append(c)
+        return {
+            "table_name": self.table_name,
+            "old_schema_version": self.old_schema_version,
+            "new_schema_version": self.new_schema_version,
+            "changes": changes,
+            "overall_severity": self.overall_severity.value,
+            "summary": self.summary,
+            "changes_by_type": by_type,
+        }
 
     def to_json(self) -> str:
-        return json.dumps(self.to_dict(), indent=2, default=str)
+        return _json.dumps(self.to_dict())
 
 
 # ─────────────────────────────────────────────
@@ -225,7 +307,7 @@ class RestCheckerConfig:
         return asdict(self)
 
     def to_json(self) -> str:
-        return json.dumps(self.to_dict(), indent=2, default=str)
+        return _json.dumps(self.to_dict(), default=str)
 
     @classmethod
     def from_dict(cls, d: dict) -> "RestCheckerConfig":
@@ -265,7 +347,7 @@ class PostgresCheckerConfig:
         return asdict(self)
 
     def to_json(self) -> str:
-        return json.dumps(self.to_dict(), indent=2, default=str)
+        return _json.dumps(self.to_dict(), default=str)
 
     @classmethod
     def from_dict(cls, d: dict) -> "PostgresCheckerConfig":
@@ -298,7 +380,13 @@ class ToolResult:
     next_action_hint: Optional[str] = None   # optional nudge for the agent
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        # data is already plain JSON-shaped; it is returned as-is rather than deep-copied.
+        return {
+            "success": self.success,
+            "data": self.data,
+            "error": self.error,
+            "next_action_hint": self.next_action_hint,
+        }
 
     def to_json(self) -> str:
-        return json.dumps(self.to_dict(), indent=2, default=str)
+        return _json.dumps(self.to_dict(), default=str)
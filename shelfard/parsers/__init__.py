@@ -1,2 +1,4 @@
 from .json_reader import get_schema_from_json
-from .json_file_reader import infer_schema_from_json_file, read_and_register_json_file
+from .json_file_reader import (
+    infer_schema_from_json_file, infer_schema_from_json_bytes, read_and_register_json_file,
+)
@@ -8,22 +8,62 @@ This is a document parser, not a live source introspector, so it does not
 implement the SchemaReader ABC.
 """
 
-import json
 import os
 import re
-from datetime import datetime
+from datetime import datetime, timezone
 
+from .. import _json
 from ..models import ColumnSchema, ColumnType, TableSchema, ToolResult
 from ..registry import register_schema
 
 
-_ISO_DATETIME_RE = re.compile(r'^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}')
-_ISO_DATE_RE     = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+# One pass for both shapes: group 1 is set only when a time part follows the date.
+_ISO_RE = re.compile(r'\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}:\d{2})?')
+
+# How many leading records of a top-level array are merged into one schema.
+DEFAULT_SAMPLE_SIZE = 16
+
+# Scalar type pairs that merge into a common wider type; any other conflict
+# becomes JSON (if a nested value is involved) or VARCHAR.
+_TYPE_MERGE = {
+    frozenset((ColumnType.INTEGER, ColumnType.FLOAT)):  ColumnType.FLOAT,
+    frozenset((ColumnType.DATE, ColumnType.TIMESTAMP)): ColumnType.TIMESTAMP,
+}
+_NESTED_TYPES = {ColumnType.STRUCT, ColumnType.ARRAY, ColumnType.JSON}
+
+# Exact-type lookup for non-string leaves. Keyed on type(), so bool never
+# collides with int; subclasses fall through to the isinstance checks.
+_TYPE_DISPATCH = {
+    type(None): ColumnType.UNKNOWN,
+    bool:       ColumnType.BOOLEAN,
+    int:        ColumnType.INTEGER,
+    float:      ColumnType.FLOAT,
+    list:       ColumnType.ARRAY,
+}
+
+
+def _infer_string_type(value: str) -> ColumnType:
+    # Cheap reject before the regex: ISO dates are >= 10 chars with '-' at index 4.
+    if len(value) < 10 or value[4] != "-":
+        return ColumnType.VARCHAR
+    m = _ISO_RE.match(value)
+    if m is None:
+        return ColumnType.VARCHAR
+    if m.group(1):
+        return ColumnType.TIMESTAMP
+    if m.end() == len(value):
+        return ColumnType.DATE
+    return ColumnType.VARCHAR
 
 
 def _infer_column_type(value) -> ColumnType:
-    if value is None:
-        return ColumnType.UNKNOWN
+    t = type(value)
+    if t is str:
+        return _infer_string_type(value)
+    ct = _TYPE_DISPATCH.get(t)
+    if ct is not None:
+        return ct
+    # Subclasses of the JSON leaf types (rare outside hand-built input).
     if isinstance(value, bool):   # must check before int — bool is int subclass
         return ColumnType.BOOLEAN
     if isinstance(value, int):
@@ -33,80 +73,167 @@ def _infer_column_type(value) -> ColumnType:
     if isinstance(value, list):
         return ColumnType.ARRAY
     if isinstance(value, str):
-        if _ISO_DATETIME_RE.match(value):
-            return ColumnType.TIMESTAMP
-        if _ISO_DATE_RE.match(value):
-            return ColumnType.DATE
-        return ColumnType.VARCHAR
+        return _infer_string_type(value)
     return ColumnType.UNKNOWN
 
 
 def _build_column_schema(key: str, value) -> ColumnSchema:
-    """Build a ColumnSchema for a single key/value pair, recursing into dicts as STRUCT."""
-    if isinstance(value, dict):
-        nested = [_build_column_schema(k, v) for k, v in value.items()]
-        return ColumnSchema(name=key, col_type=ColumnType.STRUCT, nullable=False, fields=nested)
-    return ColumnSchema(name=key, col_type=_infer_column_type(value), nullable=(value is None))
+    """
+    Build a ColumnSchema for a single key/value pair; nested dicts become STRUCT.
 
+    Walks nested dicts with an explicit stack instead of recursion, so deeply
+    nested payloads cannot hit the recursion limit. A STRUCT is built once all
+    of its fields are done (ColumnSchema is frozen), preserving key order.
+    """
+    if not isinstance(value, dict):
+        return ColumnSchema(name=key, col_type=_infer_column_type(value), nullable=(value is None))
+
+    done: list[ColumnSchema] = []
+    # Frames: (struct name, remaining items, fields built so far, list to append the struct to)
+    stack = [(key, iter(value.items()), [], done)]
+    while stack:
+        name, items, fields, parent = stack[-1]
+        for k, v in items:
+            if isinstance(v, dict):
+                stack.append((k, iter(v.items()), [], fields))
+                break
+            fields.append(ColumnSchema(name=k, col_type=_infer_column_type(v), nullable=(v is None)))
+        else:
+            stack.pop()
+            parent.append(ColumnSchema(name=name, col_type=ColumnType.STRUCT, nullable=False, fields=fields))
+    return done[0]
+
+
+def _merge_types(a: ColumnType, b: ColumnType) -> ColumnType:
+    if a == b:
+        return a
+    merged = _TYPE_MERGE.get(frozenset((a, b)))
+    if merged is not None:
+        return merged
+    if a in _NESTED_TYPES or b in _NESTED_TYPES:
+        return ColumnType.JSON
+    return ColumnType.VARCHAR
+
+
+def _columns_from_records(records: list[dict]) -> list[ColumnSchema]:
+    """
+    Infer one column list covering every sampled record.
 
-def _load_json_object(file_path: str) -> ToolResult:
-    if not os.path.exists(file_path):
+    Columns appear in first-seen order. A column is nullable if any sample has
+    it null or missing. Conflicting types are merged via _merge_types(), and
+    STRUCT columns merge their fields the same way.
+    """
+    if len(records) == 1:
+        return [_build_column_schema(k, v) for k, v in records[0].items()]
+
+    values_by_key: dict[str, list] = {}
+    for record in records:
+        for k, v in record.items():
+            values_by_key.setdefault(k, []).append(v)
+
+    columns = []
+    for k, values in values_by_key.items():
+        present = [v for v in values if v is not None]
+        nullable = len(present) < len(records)
+        if not present:
+            columns.append(ColumnSchema(name=k, col_type=ColumnType.UNKNOWN, nullable=True))
+        elif all(isinstance(v, dict) for v in present):
+            columns.append(ColumnSchema(
+                name=k, col_type=ColumnType.STRUCT, nullable=nullable,
+                fields=_columns_from_records(present),
+            ))
+        else:
+            col_type = None
+            for v in present:
+                t = ColumnType.STRUCT if isinstance(v, dict) else _infer_column_type(v)
+                col_type = t if col_type is None else _merge_types(col_type, t)
+            columns.append(ColumnSchema(name=k, col_type=col_type, nullable=nullable))
+    return columns
+
+
+def _parse_json_records(data: bytes | str, source: str, sample_size: int) -> ToolResult:
+    """Decode a JSON document into the records to infer from (the leading elements of an array)."""
+    try:
+        data = _json.loads_head(data, sample_size)
+    except (_json.JSONDecodeError, UnicodeDecodeError) as e:
+        return ToolResult(success=False, error=f"Invalid JSON in {source}: {e}")
+
+    records = data if isinstance(data, list) else [data]
+    if not records:
+        return ToolResult(success=False, error="JSON array is empty — cannot infer schema.")
+
+    if not isinstance(records[0], dict):
         return ToolResult(
             success=False,
-            error=f"File not found: {file_path}",
-            next_action_hint="Provide a valid path to a JSON file.",
+            error=f"Expected a JSON object (or array of objects), got {type(records[0]).__name__}.",
         )
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
-        return ToolResult(success=False, error=f"Invalid JSON in {file_path}: {e}")
 
-    if isinstance(data, list):
-        if not data:
-            return ToolResult(success=False, error="JSON array is empty — cannot infer schema.")
-        data = data[0]
+    return ToolResult(success=True, data={"records": [r for r in records if isinstance(r, dict)]})
 
-    if not isinstance(data, dict):
+
+def _load_json_records(file_path: str, sample_size: int) -> ToolResult:
+    if not os.path.exists(file_path):
         return ToolResult(
             success=False,
-            error=f"Expected a JSON object (or array of objects), got {type(data).__name__}.",
+            error=f"File not found: {file_path}",
+            next_action_hint="Provide a valid path to a JSON file.",
         )
+    with open(file_path, "rb") as f:
+        return _parse_json_records(f.read(), file_path, sample_size)
 
-    return ToolResult(success=True, data={"obj": data})
 
-
-def _build_table_schema(obj: dict, schema_name: str) -> TableSchema:
-    columns = [_build_column_schema(key, value) for key, value in obj.items()]
+def _build_table_schema(records: list[dict], schema_name: str) -> TableSchema:
+    columns = _columns_from_records(records)
     return TableSchema(
         table_name=schema_name,
         columns=columns,
         source="json_file",
-        captured_at=datetime.utcnow().isoformat(),
+        captured_at=datetime.now(timezone.utc).isoformat(),
     )
 
 
-def infer_schema_from_json_file(file_path: str, schema_name: str) -> ToolResult:
+def infer_schema_from_json_file(
+    file_path: str, schema_name: str, *, sample_size: int = DEFAULT_SAMPLE_SIZE
+) -> ToolResult:
     """Read a JSON file, infer TableSchema, return without registering.
 
+    For a top-level array, the first sample_size records are merged into one schema.
+    Returns ToolResult with data={"schema": schema.to_dict()}
+    """
+    load_result = _load_json_records(file_path, sample_size)
+    if not load_result.success:
+        return load_result
+
+    schema = _build_table_schema(load_result.data["records"], schema_name)
+    return ToolResult(success=True, data={"schema": schema.to_dict()})
+
+
+def infer_schema_from_json_bytes(
+    data: bytes | str, schema_name: str, *, sample_size: int = DEFAULT_SAMPLE_SIZE
+) -> ToolResult:
+    """Infer TableSchema from an in-memory JSON document, without touching disk.
+
+    For a top-level array, the first sample_size records are merged into one schema.
     Returns ToolResult with data={"schema": schema.to_dict()}
     """
-    load_result = _load_json_object(file_path)
+    load_result = _parse_json_records(data, "payload", sample_size)
     if not load_result.success:
         return load_result
 
-    schema = _build_table_schema(load_result.data["obj"], schema_name)
+    schema = _build_table_schema(load_result.data["records"], schema_name)
     return ToolResult(success=True, data={"schema": schema.to_dict()})
 
 
-def read_and_register_json_file(file_path: str, schema_name: str) -> ToolResult:
+def read_and_register_json_file(
+    file_path: str, schema_name: str, *, sample_size: int = DEFAULT_SAMPLE_SIZE
+) -> ToolResult:
     """Read a JSON file, infer TableSchema, and register it in the schema registry.
 
     Returns ToolResult from register_schema() on success.
     """
-    load_result = _load_json_object(file_path)
+    load_result = _load_json_records(file_path, sample_size)
     if not load_result.success:
         return load_result
 
-    schema = _build_table_schema(load_result.data["obj"], schema_name)
+    schema = _build_table_schema(load_result.data["records"], schema_name)
     return register_schema(schema_name, schema)
@@ -8,11 +8,36 @@ This is a document deserializer, not a live source introspector,
 so it does not implement the SchemaReader ABC.
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 
 from ..models import ColumnSchema, TableSchema, ToolResult, ColumnType
 
 
+def _table_schema_from_dict(schema_dict: dict) -> TableSchema:
+    """Build the TableSchema for get_schema_from_json(); raises on malformed input."""
+    columns = []
+    for col in schema_dict.get("columns", []):
+        # Normalise the key name so both "col_type" and "type" work
+        if "type" in col and "col_type" not in col:
+            col = {**col, "col_type": col["type"]}
+        columns.append(ColumnSchema.from_dict(col))
+
+    return TableSchema(
+        table_name=schema_dict["table_name"],
+        columns=columns,
+        partition_keys=schema_dict.get("partition_keys", []),
+        clustering_keys=schema_dict.get("clustering_keys", []),
+        source=schema_dict.get("source", "json_payload"),
+        captured_at=datetime.now(timezone.utc).isoformat(),
+    )
+
+
+def _parse_error(e: Exception) -> str:
+    if isinstance(e, KeyError):
+        return f"Missing required field in schema dict: {e}"
+    return f"Failed to parse schema from JSON: {e}"
+
+
 def get_schema_from_json(schema_dict: dict) -> ToolResult:
     """
     Constructs a TableSchema from a raw dict.
@@ -27,28 +52,11 @@ def get_schema_from_json(schema_dict: dict) -> ToolResult:
     }
     """
     try:
-        columns = []
-        for col in schema_dict.get("columns", []):
-            # Normalise the key name so both "col_type" and "type" work
-            if "type" in col and "col_type" not in col:
-                col = {**col, "col_type": col["type"]}
-            columns.append(ColumnSchema.from_dict(col))
-
-        schema = TableSchema(
-            table_name=schema_dict["table_name"],
-            columns=columns,
-            partition_keys=schema_dict.get("partition_keys", []),
-            clustering_keys=schema_dict.get("clustering_keys", []),
-            source=schema_dict.get("source", "json_payload"),
-            captured_at=datetime.utcnow().isoformat(),
-        )
-
-        return ToolResult(
-            success=True,
-            data={"schema": schema.to_dict()}
-        )
-
-    except KeyError as e:
-        return ToolResult(success=False, error=f"Missing required field in schema dict: {e}")
+        schema = _table_schema_from_dict(schema_dict)
     except Exception as e:
-        return ToolResult(success=False, error=f"Failed to parse schema from JSON: {e}")
+        return ToolResult(success=False, error=_parse_error(e))
+
+    return ToolResult(
+        success=True,
+        data={"schema": schema.to_dict()}
+    )
@@ -26,6 +26,7 @@ __all__ = [
     "SQLRegistry",
     # convenience shims
     "register_schema",
+    "register_schemas",
     "get_registered_schema",
     "get_all_schemas",
     "subscribe_consumer",
@@ -51,6 +52,7 @@ __all__ = [
 _default = LocalFileRegistry()
 
 register_schema              = _default.register_schema
+register_schemas             = _default.register_schemas
 get_registered_schema        = _default.get_registered_schema
 get_all_schemas              = _default.get_all_schemas
 subscribe_consumer           = _default.subscribe_consumer
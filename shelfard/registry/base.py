@@ -23,6 +23,24 @@ class SchemaRegistry(ABC):
         """Save a new version of a source schema to the registry."""
         ...
 
+    def register_schemas(self, schemas: list[tuple[str, TableSchema]]) -> ToolResult:
+        """
+        Save several source schema versions in one call, in order.
+
+        register_schema(name, s) is equivalent to register_schemas([(name, s)]).
+        Backends override this to batch their writes; the default simply calls
+        register_schema() per pair and stops at the first failure.
+        Returns ToolResult with data={"registered": [{"table_name": ..., "registered_at": ...,
+        "version_count": ...}, ...]}.
+        """
+        registered = []
+        for table_name, schema in schemas:
+            result = self.register_schema(table_name, schema)
+            if not result.success:
+                return result
+            registered.append({"table_name": table_name, **result.data})
+        return ToolResult(success=True, data={"registered": registered})
+
     @abstractmethod
     def get_registered_schema(self, table_name: str, version: str = "latest") -> ToolResult:
         """
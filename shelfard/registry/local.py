@@ -14,11 +14,11 @@ Each JSON file stores: {"table_name": "...", "versions": [...]}
 
 from __future__ import annotations
 
-import json
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+from .. import _json
 from ..models import (
     ColumnSchema, TableSchema, ConsumerSubscription, SchemaDiff, ToolResult,
     RestCheckerConfig, PostgresCheckerConfig,
@@ -26,6 +26,10 @@ from ..models import (
 from .base import SchemaRegistry
 
 
+# Bound once: column lists are rebuilt via map(), with no per-item method lookup.
+_from_dict = ColumnSchema.from_dict
+
+
 class LocalFileRegistry(SchemaRegistry):
     """
     File-based registry. Default root is <project_root>/schemas/.
@@ -37,6 +41,9 @@ class LocalFileRegistry(SchemaRegistry):
         if registry_dir is None:
             registry_dir = Path(__file__).parent.parent.parent / "schemas"
         self._root = Path(registry_dir)
+        # Parsed source schemas: path → ((st_mtime_ns, st_size), {version: TableSchema}).
+        # A changed stamp means the file was rewritten; _save_json also drops the entry.
+        self._schema_cache: dict[Path, tuple[tuple[int, int], dict[str, TableSchema]]] = {}
 
     # ── Internal helpers ──────────────────────────────────────────────────────
 
@@ -54,14 +61,12 @@ class LocalFileRegistry(SchemaRegistry):
 
     @staticmethod
     def _load_json(path: Path) -> dict:
-        with open(path) as f:
-            return json.load(f)
+        return _json.loads(path.read_bytes())
 
-    @staticmethod
-    def _save_json(path: Path, data: dict) -> None:
+    def _save_json(self, path: Path, data: dict) -> None:
+        self._schema_cache.pop(path, None)
         path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+        path.write_text(_json.dumps(data, default=str), encoding="utf-8")
 
     # ── Source schemas ────────────────────────────────────────────────────────
 
@@ -74,7 +79,7 @@ class LocalFileRegistry(SchemaRegistry):
             else:
                 registry_data = {"table_name": table_name, "versions": []}
 
-            schema.captured_at = datetime.utcnow().isoformat()
+            schema.captured_at = datetime.now(timezone.utc).isoformat()
             registry_data["versions"].append(schema.to_dict())
             self._save_json(path, registry_data)
 
@@ -89,11 +94,52 @@ class LocalFileRegistry(SchemaRegistry):
         except Exception as e:
             return ToolResult(success=False, error=f"Failed to register schema: {e}")
 
+    def register_schemas(self, schemas: list[tuple[str, TableSchema]]) -> ToolResult:
+        """Save several source schema versions, reading and writing each table file once."""
+        try:
+            pending: dict[str, dict] = {}
+            registered = []
+            for table_name, schema in schemas:
+                registry_data = pending.get(table_name)
+                if registry_data is None:
+                    path = self._source_path(table_name)
+                    if path.exists():
+                        registry_data = self._load_json(path)
+                    else:
+                        registry_data = {"table_name": table_name, "versions": []}
+                    pending[table_name] = registry_data
+
+                schema.captured_at = datetime.now(timezone.utc).isoformat()
+                registry_data["versions"].append(schema.to_dict())
+                registered.append({
+                    "table_name": table_name,
+                    "registered_at": schema.captured_at,
+                    "version_count": len(registry_data["versions"]),
+                })
+
+            for table_name, registry_data in pending.items():
+                self._save_json(self._source_path(table_name), registry_data)
+
+            return ToolResult(
+                success=True,
+                data={"registered": registered},
+                next_action_hint="Schemas registered. Future drift checks will compare against the latest versions.",
+            )
+        except Exception as e:
+            return ToolResult(success=False, error=f"Failed to register schemas: {e}")
+
     def get_registered_schema(self, table_name: str, version: str = "latest") -> ToolResult:
-        """Retrieve a source schema version from the registry."""
+        """
+        Retrieve a source schema version from the registry.
+
+        The rebuilt TableSchema is cached per version while the file's mtime and
+        size are unchanged, so repeated drift checks skip the parse and rebuild.
+        """
         path = self._source_path(table_name)
 
-        if not path.exists():
+        try:
+            st = path.stat()
+        except FileNotFoundError:
             return ToolResult(
                 success=False,
                 error=f"No registered schema found for '{table_name}'. "
@@ -102,32 +148,42 @@ class LocalFileRegistry(SchemaRegistry):
             )
 
         try:
-            registry_data = self._load_json(path)
+            stamp = (st.st_mtime_ns, st.st_size)
+            cached = self._schema_cache.get(path)
+            if cached is None or cached[0] != stamp:
+                cached = (stamp, {})
+                self._schema_cache[path] = cached
+            by_version = cached[1]
+
+            schema = by_version.get(version)
+            if schema is None:
+                registry_data = self._load_json(path)
 
-            if version == "latest":
-                entry = registry_data["versions"][-1]
-            else:
-                matches = [v for v in registry_data["versions"] if v["captured_at"] == version]
-                if not matches:
-                    return ToolResult(
-                        success=False,
-                        error=f"Version '{version}' not found for table '{table_name}'.",
-                    )
-                entry = matches[0]
-
-            columns = [ColumnSchema.from_dict(col) for col in entry["columns"]]
-            schema = TableSchema(
-                table_name=table_name,
-                columns=columns,
-                partition_keys=entry.get("partition_keys", []),
-                clustering_keys=entry.get("clustering_keys", []),
-                source=entry.get("source", "registry"),
-                captured_at=entry["captured_at"],
-            )
+                if version == "latest":
+                    entry = registry_data["versions"][-1]
+                else:
+                    matches = [v for v in registry_data["versions"] if v["captured_at"] == version]
+                    if not matches:
+                        return ToolResult(
+                            success=False,
+                            error=f"Version '{version}' not found for table '{table_name}'.",
+                        )
+                    entry = matches[0]
+
+                columns = list(map(_from_dict, entry["columns"]))
+                schema = TableSchema(
+                    table_name=table_name,
+                    columns=columns,
+                    partition_keys=entry.get("partition_keys", []),
+                    clustering_keys=entry.get("clustering_keys", []),
+                    source=entry.get("source", "registry"),
+                    captured_at=entry["captured_at"],
+                )
+                by_version[version] = schema
 
             return ToolResult(
                 success=True,
-                data={"schema": schema.to_dict(), "version": entry["captured_at"]},
+                data={"schema": schema.to_dict(), "version": schema.captured_at},
                 next_action_hint="Use compare_schemas() to diff this against an incoming schema.",
             )
         except Exception as e:
@@ -182,7 +238,7 @@ class LocalFileRegistry(SchemaRegistry):
 
         source_version = source_result.data["version"]
         source_schema_dict = source_result.data["schema"]
-        all_columns = [ColumnSchema.from_dict(c) for c in source_schema_dict["columns"]]
+        all_columns = list(map(_from_dict, source_schema_dict["columns"]))
 
         hint = None
         if columns is not None:
@@ -215,7 +271,7 @@ class LocalFileRegistry(SchemaRegistry):
             source_table=table_name,
             subscribed_columns=columns,
             schema=snapshot,
-            subscribed_at=datetime.utcnow().isoformat(),
+            subscribed_at=datetime.now(timezone.utc).isoformat(),
             source_schema_version=source_version,
         )
 
@@ -340,7 +396,7 @@ class LocalFileRegistry(SchemaRegistry):
         config: RestCheckerConfig | PostgresCheckerConfig,
     ) -> ToolResult:
         """Store a checker config. Always overwrites — checkers are not versioned."""
-        config.registered_at = datetime.utcnow().isoformat()
+        config.registered_at = datetime.now(timezone.utc).isoformat()
         path = self._checker_path(schema_name)
         try:
             self._save_json(path, config.to_dict())
@@ -10,12 +10,20 @@ The output SchemaDiff is designed to be:
 3. Actionable — severity is pre-classified so the agent can route appropriately
 """
 
+from itertools import zip_longest
+
 from .models import (
     ColumnSchema, TableSchema, SchemaDiff, ColumnChange,
     ChangeType, ChangeSeverity, ToolResult, ColumnType
 )
 from .type_normalizer import is_safe_widening
-from .parsers.json_reader import get_schema_from_json
+from .parsers.json_reader import _parse_error, _table_schema_from_dict
+
+# Enum members tested once per compared column, bound at module level so the
+# checks skip the class attribute lookup.
+_STRUCT  = ColumnType.STRUCT
+_VARCHAR = ColumnType.VARCHAR
+_DECIMAL = ColumnType.DECIMAL
 
 
 # ─────────────────────────────────────────────
@@ -51,7 +59,7 @@ def _classify_type_change(
 
     # Same logical type — check length/precision changes
     if old_t == new_t:
-        if old_t == ColumnType.VARCHAR:
+        if old_t == _VARCHAR:
             old_len = old_col.max_length or 0
             new_len = new_col.max_length or 0
             if new_len > old_len or new_len == 0:
@@ -68,7 +76,7 @@ def _classify_type_change(
                     f"existing data may be truncated on write."
                 )
 
-        if old_t == ColumnType.DECIMAL:
+        if old_t == _DECIMAL:
             old_prec = old_col.precision or 0
             new_prec = new_col.precision or 0
             if new_prec >= old_prec:
@@ -136,16 +144,46 @@ def _diff_column_list(
 
     name_prefix is dot-notation context for nested STRUCT fields,
     e.g. "address." produces change names like "address.street".
-    Calls itself recursively when both sides have a STRUCT column.
     """
+    changes: list[ColumnChange] = []
+    _diff_column_list_into(old_columns, new_columns, name_prefix, changes)
+    return changes
+
+
+def _diff_column_list_into(
+    old_columns: list[ColumnSchema],
+    new_columns: list[ColumnSchema],
+    name_prefix: str,
+    changes: list[ColumnChange],
+) -> None:
+    """
+    Append the changes between two column lists to `changes`.
+
+    Calls itself recursively when both sides have a STRUCT column, appending
+    nested changes into the same list instead of building one per level.
+    """
+    # No-drift fast path: matching fingerprints in the same order means every
+    # check below would come up empty. Tuples are compared, not just hashed.
+    if len(old_columns) == len(new_columns) and all(
+        old is new or old._fingerprint() == new._fingerprint()
+        for old, new in zip(old_columns, new_columns)
+    ):
+        return
+
     old_cols = {col.name: col for col in old_columns}
     new_cols = {col.name: col for col in new_columns}
 
-    changes: list[ColumnChange] = []
+    # Key-view set algebra runs in C. The loops below walk the dicts only when
+    # there is something to report, and in dict order so output stays stable.
+    old_keys = old_cols.keys()
+    new_keys = new_cols.keys()
+    removed = old_keys - new_keys
+    added = new_keys - old_keys
 
     # ── Detect removed columns ──────────────────────────────────────
-    for col_name, old_col in old_cols.items():
-        if col_name not in new_cols:
+    for col_name in (old_cols if removed else ()):
+        if col_name in removed:
+            old_col = old_cols[col_name]
             qualified = f"{name_prefix}{col_name}"
             changes.append(ColumnChange(
                 change_type=ChangeType.COLUMN_REMOVED,
@@ -158,8 +196,9 @@ def _diff_column_list(
             ))
 
     # ── Detect added columns ────────────────────────────────────────
-    for col_name, new_col in new_cols.items():
-        if col_name not in old_cols:
+    for col_name in (new_cols if added else ()):
+        if col_name in added:
+            new_col = new_cols[col_name]
             qualified = f"{name_prefix}{col_name}"
             severity = _classify_added_column(new_col)
             reasoning = (
@@ -181,21 +220,24 @@ def _diff_column_list(
 
     # ── Detect modifications on existing columns ────────────────────
     for col_name in old_cols:
-        if col_name not in new_cols:
+        if col_name in removed:
             continue  # already handled above
 
         old_col = old_cols[col_name]
         new_col = new_cols[col_name]
+        # Unchanged column (nested fields included): one packed-tuple compare
+        # instead of the attribute-by-attribute checks below.
+        if old_col._fingerprint() == new_col._fingerprint():
+            continue
         qualified = f"{name_prefix}{col_name}"
 
         # Both sides are STRUCT — recurse into nested fields
-        if old_col.col_type == ColumnType.STRUCT and new_col.col_type == ColumnType.STRUCT:
-            changes.extend(
-                _diff_column_list(
-                    old_col.fields or [],
-                    new_col.fields or [],
-                    f"{qualified}.",
-                )
+        if old_col.col_type == _STRUCT and new_col.col_type == _STRUCT:
+            _diff_column_list_into(
+                old_col.fields or [],
+                new_col.fields or [],
+                f"{qualified}.",
+                changes,
             )
             continue
 
@@ -245,12 +287,14 @@ def _diff_column_list(
             ))
 
     # ── Detect column reordering ────────────────────────────────────
-    shared_cols_old = [c for c in old_columns if c.name in new_cols]
-    shared_cols_new = [c for c in new_columns if c.name in old_cols]
-    old_order = [c.name for c in shared_cols_old]
-    new_order = [c.name for c in shared_cols_new]
-
-    if old_order != new_order:
+    # Walk the shared columns of both sides in lockstep and stop at the first
+    # position that differs; the order lists are only built when reporting.
+    old_shared = (c.name for c in old_columns if c.name not in removed)
+    new_shared = (c.name for c in new_columns if c.name not in added)
+
+    if any(a != b for a, b in zip_longest(old_shared, new_shared)):
+        old_order = [c.name for c in old_columns if c.name not in removed]
+        new_order = [c.name for c in new_columns if c.name not in added]
         reorder_name = f"{name_prefix}<multiple>" if name_prefix else "<multiple>"
         changes.append(ColumnChange(
             change_type=ChangeType.COLUMN_REORDERED,
@@ -263,8 +307,6 @@ def _diff_column_list(
                       "may read wrong values silently — the most dangerous kind of bug."
         ))
 
-    return changes
-
 
 # ─────────────────────────────────────────────
 # Main comparison function
@@ -282,22 +324,28 @@ def compare_schemas(old_schema: TableSchema, new_schema: TableSchema) -> ToolRes
         ToolResult with SchemaDiff in data
     """
     try:
-        changes = _diff_column_list(old_schema.columns, new_schema.columns)
+        if old_schema.columns is new_schema.columns:
+            # Same column list object (e.g. a schema compared with itself) — nothing to diff.
+            changes = []
+        else:
+            changes = _diff_column_list(old_schema.columns, new_schema.columns)
+
+        # ── Tally severities (one pass) and pick the worst ──────────────
+        counts = dict.fromkeys(ChangeSeverity, 0)
+        for c in changes:
+            counts[c.severity] += 1
+        n_breaking = counts[ChangeSeverity.BREAKING]
+        n_warning  = counts[ChangeSeverity.WARNING]
+        n_safe     = counts[ChangeSeverity.SAFE]
 
-        # ── Compute overall severity ────────────────────────────────────
-        severities = [c.severity for c in changes]
-        if ChangeSeverity.BREAKING in severities:
+        if n_breaking:
             overall = ChangeSeverity.BREAKING
-        elif ChangeSeverity.WARNING in severities:
+        elif n_warning:
             overall = ChangeSeverity.WARNING
         else:
             overall = ChangeSeverity.SAFE
 
         # ── Build human-readable summary ────────────────────────────────
-        n_breaking = sum(1 for c in changes if c.severity == ChangeSeverity.BREAKING)
-        n_warning  = sum(1 for c in changes if c.severity == ChangeSeverity.WARNING)
-        n_safe     = sum(1 for c in changes if c.severity == ChangeSeverity.SAFE)
-
         if not changes:
             summary = "No schema changes detected. Schemas are identical."
         else:
@@ -337,25 +385,15 @@ def compare_schemas_from_dicts(old_dict: dict, new_dict: dict) -> ToolResult:
     Convenience wrapper — takes raw dicts (as returned by schema acquisition tools)
     and compares them. This is what the agent will call most often.
     """
-    old_result = get_schema_from_json(old_dict)
-    new_result = get_schema_from_json(new_dict)
-
-    if not old_result.success:
-        return ToolResult(success=False, error=f"Old schema invalid: {old_result.error}")
-    if not new_result.success:
-        return ToolResult(success=False, error=f"New schema invalid: {new_result.error}")
-
-    def dict_to_table_schema(d: dict) -> TableSchema:
-        s = d["schema"]
-        return TableSchema(
-            table_name=s["table_name"],
-            columns=[ColumnSchema.from_dict(c) for c in s["columns"]],
-            partition_keys=s.get("partition_keys", []),
-            captured_at=s.get("captured_at"),
-            source=s.get("source", "unknown"),
-        )
+    # Build the TableSchema objects directly rather than round-tripping each side
+    # through get_schema_from_json()'s dict output and back.
+    try:
+        old_schema = _table_schema_from_dict(old_dict)
+    except Exception as e:
+        return ToolResult(success=False, error=f"Old schema invalid: {_parse_error(e)}")
+    try:
+        new_schema = _table_schema_from_dict(new_dict)
+    except Exception as e:
+        return ToolResult(success=False, error=f"New schema invalid: {_parse_error(e)}")
 
-    return compare_schemas(
-        dict_to_table_schema(old_result.data),
-        dict_to_table_schema(new_result.data),
-    )
+    return compare_schemas(old_schema, new_schema)
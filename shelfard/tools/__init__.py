@@ -1,4 +1,4 @@
 from .base import SchemaReader, Checker
 from .sqlite import SQLiteReader, get_sqlite_schema, list_sqlite_tables
-from .rest import RestEndpointReader, get_rest_schema, RestChecker
+from .rest import RestEndpointReader, get_rest_schema, get_rest_schemas, RestChecker
 from .postgres import PostgresReader, get_postgres_schema, list_postgres_tables, PostgresChecker
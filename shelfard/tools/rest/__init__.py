@@ -1,2 +1,2 @@
-from .reader import RestEndpointReader, get_rest_schema, infer_schema_from_openapi
+from .reader import RestEndpointReader, get_rest_schema, get_rest_schemas, infer_schema_from_openapi
 from .checker import RestChecker
@@ -8,13 +8,36 @@ over time.
 infer_schema_from_openapi() is planned but not yet implemented.
 """
 
-from datetime import datetime
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.cookiejar import DefaultCookiePolicy
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from ... import _json
 from ..base import SchemaReader
 from ...models import TableSchema, ToolResult
-from ...parsers.json_file_reader import _build_column_schema
+from ...parsers.json_file_reader import DEFAULT_SAMPLE_SIZE, _columns_from_records
+
+
+def _make_session() -> requests.Session:
+    """Pooled session: keep-alive connections are reused across fetches to the same host."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Readers are stateless, like bare requests.get(): never carry cookies between fetches.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+# Shared by every RestEndpointReader that is not given its own session.
+_SESSION = _make_session()
+
+# Response bodies are read in chunks of this size until the first record decodes.
+_CHUNK_SIZE = 64 * 1024
 
 
 class RestEndpointReader(SchemaReader):
@@ -33,6 +56,8 @@ class RestEndpointReader(SchemaReader):
         *,
         bearer_token: str | None = None,
         headers: dict | None = None,
+        session: requests.Session | None = None,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
     ):
         """
         Args:
@@ -40,26 +65,49 @@ class RestEndpointReader(SchemaReader):
             schema_name:  Logical name for the schema (used as table_name in TableSchema).
             bearer_token: Convenience param — sets Authorization: Bearer <token>.
             headers:      Arbitrary extra headers; merged last so they override bearer_token.
+            session:      HTTP session to fetch with; defaults to a module-wide pooled session.
+            sample_size:  For array responses, how many leading records are merged into the schema.
         """
         self.url = url
         self.schema_name = schema_name
+        self._session = session if session is not None else _SESSION
+        # The module-wide _SESSION is shared by every reader and must outlive them.
+        self._owns_session = session is not None
+        self.sample_size = sample_size
         self._headers: dict[str, str] = {}
         if bearer_token:
             self._headers["Authorization"] = f"Bearer {bearer_token}"
         if headers:
             self._headers.update(headers)
+        # Built on the first fetch and re-sent on every later poll (see _prepare()).
+        self._prepared: requests.PreparedRequest | None = None
+
+    def _prepare(self) -> requests.PreparedRequest:
+        """Prepare the GET once: URL parsing and header merging are not repeated per poll."""
+        if self._prepared is None:
+            request = requests.Request("GET", self.url, headers=self._headers)
+            self._prepared = self._session.prepare_request(request)
+        return self._prepared
 
     def get_schema(self) -> ToolResult:
         """
         Fetches the endpoint and infers a TableSchema from the JSON response.
 
-        Supports both object and array-of-objects responses (uses first element).
+        Supports both object and array-of-objects responses (merges the first
+        sample_size elements: missing or null fields are nullable).
         Nested dicts are inferred as STRUCT columns recursively.
         """
         try:
-            response = requests.get(self.url, headers=self._headers, timeout=30)
+            prepared = self._prepare()
+            # Streamed: for array bodies only the sampled records are ever downloaded.
+            # Same proxy/CA-bundle environment handling that Session.get() applies.
+            settings = self._session.merge_environment_settings(
+                prepared.url, proxies={}, stream=True, verify=None, cert=None
+            )
+            response = self._session.send(prepared, timeout=30, **settings)
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
+            e.response.close()
             return ToolResult(
                 success=False,
                 error=f"HTTP {e.response.status_code}: {e.response.reason}",
@@ -79,35 +127,43 @@ class RestEndpointReader(SchemaReader):
             )
 
         try:
-            data = response.json()
-        except (ValueError, requests.exceptions.JSONDecodeError) as e:
+            with response:
+                data = _json.loads_head_iter(
+                    response.iter_content(chunk_size=_CHUNK_SIZE), self.sample_size
+                )
+        except (_json.JSONDecodeError, UnicodeDecodeError) as e:
             return ToolResult(
                 success=False,
                 error=f"Response is not valid JSON: {e}",
                 next_action_hint="Ensure the endpoint returns application/json.",
             )
+        except requests.exceptions.RequestException as e:
+            return ToolResult(
+                success=False,
+                error=f"Failed while reading the response body: {e}",
+                next_action_hint="Check if the endpoint is responsive.",
+            )
 
-        if isinstance(data, list):
-            if not data:
-                return ToolResult(
-                    success=False,
-                    error="Response is an empty JSON array — cannot infer schema.",
-                    next_action_hint="Try an endpoint that returns at least one record.",
-                )
-            data = data[0]
+        records = data if isinstance(data, list) else [data]
+        if not records:
+            return ToolResult(
+                success=False,
+                error="Response is an empty JSON array — cannot infer schema.",
+                next_action_hint="Try an endpoint that returns at least one record.",
+            )
 
-        if not isinstance(data, dict):
+        if not isinstance(records[0], dict):
             return ToolResult(
                 success=False,
-                error=f"Expected a JSON object or array of objects, got {type(data).__name__}.",
+                error=f"Expected a JSON object or array of objects, got {type(records[0]).__name__}.",
             )
 
-        columns = [_build_column_schema(k, v) for k, v in data.items()]
+        columns = _columns_from_records([r for r in records if isinstance(r, dict)])
         schema = TableSchema(
             table_name=self.schema_name,
             columns=columns,
             source="rest_api",
-            captured_at=datetime.utcnow().isoformat(),
+            captured_at=datetime.now(timezone.utc).isoformat(),
         )
 
         return ToolResult(
@@ -116,6 +172,24 @@ class RestEndpointReader(SchemaReader):
             next_action_hint="Call get_registered_schema() and compare_schemas() to detect drift.",
         )
 
+    async def get_schema_async(self) -> ToolResult:
+        """Awaitable get_schema(); the blocking fetch runs in a worker thread."""
+        return await asyncio.to_thread(self.get_schema)
+
+    def close(self) -> None:
+        """
+        Drop a caller-supplied session's pooled keep-alive connections; the shared
+        default session is left open. The reader stays usable either way.
+        """
+        if self._owns_session:
+            self._session.close()
+
+    def __enter__(self) -> "RestEndpointReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
     def list_tables(self) -> ToolResult:
         """REST sources don't expose a table listing — not applicable."""
         return ToolResult(
@@ -135,6 +209,21 @@ def get_rest_schema(url: str, schema_name: str, **kwargs) -> ToolResult:
     return RestEndpointReader(url, schema_name, **kwargs).get_schema()
 
 
+def get_rest_schemas(urls_and_names: list[tuple[str, str]], **kwargs) -> list[ToolResult]:
+    """
+    Fetch several REST endpoints concurrently and infer each schema.
+
+    Returns one ToolResult per (url, schema_name) pair, in input order. Keyword
+    args are forwarded to every RestEndpointReader. Fetches share the pooled
+    session, so at most 20 run at once — one per pooled connection.
+    """
+    readers = [RestEndpointReader(url, name, **kwargs) for url, name in urls_and_names]
+    if not readers:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(readers), 20)) as pool:
+        return list(pool.map(RestEndpointReader.get_schema, readers))
+
+
 def infer_schema_from_openapi(url_or_path: str, resource_name: str) -> ToolResult:
     """Parse a Swagger/OpenAPI spec and extract a named resource as a TableSchema.
     Not yet implemented."""
@@ -5,6 +5,7 @@ Type map is ready. Reader implementation is pending.
 """
 
 from ...models import ColumnType
+from ...type_normalizer import build_exact_lookup, parse_raw_type
 
 
 _TYPE_MAP: dict[str, ColumnType] = {
@@ -40,11 +41,14 @@ _TYPE_MAP: dict[str, ColumnType] = {
 }
 
 
+_EXACT_LOOKUP = build_exact_lookup(_TYPE_MAP)
+
+
 def _normalize_type(raw_type: str) -> ColumnType:
-    cleaned = raw_type.lower().strip()
-    if "(" in cleaned:
-        cleaned = cleaned[:cleaned.index("(")].strip()
-    return _TYPE_MAP.get(cleaned, ColumnType.UNKNOWN)
+    col_type = _EXACT_LOOKUP.get(raw_type)
+    if col_type is not None:
+        return col_type
+    return _TYPE_MAP.get(parse_raw_type(raw_type)[0], ColumnType.UNKNOWN)
 
 
 # TODO: implement SnowflakeReader(SchemaReader)
@@ -2,15 +2,18 @@
 SQLite schema reader.
 
 Introspects SQLite database files using PRAGMA table_info().
+``db_path`` may also be a SQLite URI (``file:...``), e.g. a shared-cache
+in-memory database such as ``file:scratch?mode=memory&cache=shared``.
 """
 
 import sqlite3
 import os
-from datetime import datetime
+from datetime import datetime, timezone
+from urllib.request import pathname2url
 
 from ..base import SchemaReader
 from ...models import ColumnSchema, ColumnType, TableSchema, ToolResult
-from ...type_normalizer import extract_length
+from ...type_normalizer import build_exact_lookup, parse_raw_type
 
 
 _TYPE_MAP: dict[str, ColumnType] = {
@@ -38,22 +41,53 @@ _TYPE_MAP: dict[str, ColumnType] = {
 }
 
 
-def _normalize_type(raw_type: str) -> ColumnType:
-    cleaned = raw_type.lower().strip()
-    if "(" in cleaned:
-        cleaned = cleaned[:cleaned.index("(")].strip()
-    return _TYPE_MAP.get(cleaned, ColumnType.UNKNOWN)
+_EXACT_LOOKUP = build_exact_lookup(_TYPE_MAP)
+
+
+def _parse_column_type(raw_type: str) -> tuple[ColumnType, int | None]:
+    """(normalized type, max_length); bare types skip parsing via _EXACT_LOOKUP."""
+    col_type = _EXACT_LOOKUP.get(raw_type)
+    if col_type is not None:
+        return col_type, None
+    base, length = parse_raw_type(raw_type)
+    return _TYPE_MAP.get(base, ColumnType.UNKNOWN), length
 
 
 class SQLiteReader(SchemaReader):
     """
-    Reads schemas from a SQLite database file.
+    Reads schemas from a SQLite database file or ``file:`` URI.
     Both the database path and target table are provided at construction.
+
+    The connection is opened read-only on first use and reused by later
+    get_schema()/list_tables() calls, so repeated drift checks skip the
+    per-call open and pager setup. Call close() (or use the reader as a
+    context manager) to release it.
     """
 
     def __init__(self, db_path: str, table_name: str):
         self.db_path = db_path
         self.table_name = table_name
+        self._is_uri = db_path.startswith("file:")
+        self._conn: sqlite3.Connection | None = None
+
+    def _missing(self) -> bool:
+        # URIs (notably in-memory databases) have no file to check up front
+        return not self._is_uri and not os.path.exists(self.db_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cached read-only connection on first use."""
+        if self._conn is None:
+            if self._is_uri:
+                # Caller-supplied URIs keep their own mode (e.g. mode=memory);
+                # query_only below still refuses writes.
+                conn = sqlite3.connect(self.db_path, uri=True)
+            else:
+                uri = f"file:{pathname2url(os.path.abspath(self.db_path))}?mode=ro"
+                conn = sqlite3.connect(uri, uri=True)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only=ON")
+            self._conn = conn
+        return self._conn
 
     def get_schema(self) -> ToolResult:
         """
@@ -63,12 +97,11 @@ class SQLiteReader(SchemaReader):
         cid | name | type | notnull | dflt_value | pk
         """
         table_name = self.table_name
-        if not os.path.exists(self.db_path):
+        if self._missing():
             return ToolResult(success=False, error=f"Database file not found: {self.db_path}")
 
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            cursor = self._connect().cursor()
 
             # Verify table exists
             cursor.execute(
@@ -76,28 +109,26 @@ class SQLiteReader(SchemaReader):
                 (table_name,)
             )
             if not cursor.fetchone():
-                conn.close()
                 return ToolResult(
                     success=False,
                     error=f"Table '{table_name}' not found in {self.db_path}",
                     next_action_hint="Call list_sqlite_tables() to see available tables."
                 )
 
-            # Get column info
-            cursor.execute(f"PRAGMA table_info({table_name})")
+            # Get column info (table-valued form, so the name is bound, not interpolated)
+            cursor.execute("SELECT * FROM pragma_table_info(?)", (table_name,))
             rows = cursor.fetchall()
-            conn.close()
 
             columns = []
             for row in rows:
-                cid, name, raw_type, notnull, default_val, is_pk = row
-                col_type = _normalize_type(raw_type or "text")
-                max_length = extract_length(raw_type or "")
+                raw_type = row["type"]
+                default_val = row["dflt_value"]
+                col_type, max_length = _parse_column_type(raw_type or "text")
 
                 columns.append(ColumnSchema(
-                    name=name,
+                    name=row["name"],
                     col_type=col_type,
-                    nullable=not bool(notnull),
+                    nullable=not bool(row["notnull"]),
                     max_length=max_length,
                     default_value=str(default_val) if default_val is not None else None,
                 ))
@@ -106,7 +137,7 @@ class SQLiteReader(SchemaReader):
                 table_name=table_name,
                 columns=columns,
                 source="sqlite",
-                captured_at=datetime.utcnow().isoformat(),
+                captured_at=datetime.now(timezone.utc).isoformat(),
             )
 
             return ToolResult(
@@ -120,15 +151,14 @@ class SQLiteReader(SchemaReader):
 
     def list_tables(self) -> ToolResult:
         """Lists all user tables in the SQLite database."""
-        if not os.path.exists(self.db_path):
+        if self._missing():
             return ToolResult(success=False, error=f"Database file not found: {self.db_path}")
 
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-            tables = [row[0] for row in cursor.fetchall()]
-            conn.close()
+            cursor = self._connect().execute(
+                "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
+            )
+            tables = [row["name"] for row in cursor.fetchall()]
 
             return ToolResult(
                 success=True,
@@ -138,12 +168,26 @@ class SQLiteReader(SchemaReader):
         except Exception as e:
             return ToolResult(success=False, error=f"Failed to list tables: {e}")
 
+    def close(self) -> None:
+        """Close the cached connection. The reader reopens it on next use."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> "SQLiteReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
 
 # ── Backward-compatible module-level wrappers ─────────────────────────────
 
 def get_sqlite_schema(db_path: str, table_name: str) -> ToolResult:
-    return SQLiteReader(db_path, table_name).get_schema()
+    with SQLiteReader(db_path, table_name) as reader:
+        return reader.get_schema()
 
 
 def list_sqlite_tables(db_path: str) -> ToolResult:
-    return SQLiteReader(db_path, "").list_tables()
+    with SQLiteReader(db_path, "") as reader:
+        return reader.list_tables()
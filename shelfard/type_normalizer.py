@@ -6,6 +6,9 @@ This module contains only logic that operates on the canonical ColumnType enum,
 independent of any vendor's raw type strings.
 """
 
+import re
+from functools import lru_cache
+
 from .models import ColumnType
 
 
@@ -36,21 +39,57 @@ TYPE_WIDENING_RULES: dict[tuple[ColumnType, ColumnType], bool] = {
 }
 
 
+# TYPE_WIDENING_RULES packed for lookup: one bit per ColumnType, and per source
+# type the OR of the bits it may safely widen to. A check is then two plain
+# dict probes and an AND, with no tuple key built per call.
+_TYPE_BIT: dict[ColumnType, int] = {t: 1 << i for i, t in enumerate(ColumnType)}
+_WIDEN_MASK: dict[ColumnType, int] = {}
+for (_src, _dst), _safe in TYPE_WIDENING_RULES.items():
+    if _safe:
+        _WIDEN_MASK[_src] = _WIDEN_MASK.get(_src, 0) | _TYPE_BIT[_dst]
+del _src, _dst, _safe
+
+
 def is_safe_widening(from_type: ColumnType, to_type: ColumnType) -> bool:
     """
     Returns True if changing from_type to to_type is a safe widening.
     Returns False if unknown — caller should treat as WARNING.
     """
-    return TYPE_WIDENING_RULES.get((from_type, to_type), False)
+    return bool(_WIDEN_MASK.get(from_type, 0) & _TYPE_BIT.get(to_type, 0))
+
+
+# Leading integer argument of a closed "(...)" group, e.g. "255)" or " 10, 2)".
+_LEN_RE = re.compile(r"\s*(\d+)\s*(?:,[^)]*)?\)")
+
+
+@lru_cache(maxsize=512)
+def parse_raw_type(raw_type: str) -> tuple[str, int | None]:
+    """
+    Split a raw vendor type in one pass: "VARCHAR(255)" → ("varchar", 255).
+
+    The base is lowercased and stripped, ready for a reader's type map. The
+    length is the first parenthesised argument, or None when absent or not an
+    integer. Memoized, since real schemas repeat a handful of raw types.
+    """
+    base, sep, rest = raw_type.partition("(")
+    base = base.strip().lower()
+    if not sep:
+        return base, None
+    m = _LEN_RE.match(rest)
+    return base, int(m.group(1)) if m else None
 
 
 def extract_length(raw_type: str) -> int | None:
     """Extract length from varchar(255) → 255. Returns None if not present."""
-    if "(" in raw_type and ")" in raw_type:
-        try:
-            inner = raw_type[raw_type.index("(") + 1 : raw_type.index(")")]
-            parts = inner.split(",")
-            return int(parts[0].strip())
-        except (ValueError, IndexError):
-            return None
-    return None
+    return parse_raw_type(raw_type)[1]
+
+
+def build_exact_lookup(type_map: dict[str, ColumnType]) -> dict[str, ColumnType]:
+    """
+    Extend a reader's lowercase type map with an uppercase copy of every key.
+
+    Declared types usually arrive bare and in one case ("INTEGER", "text"), so
+    a single probe of the result resolves them with no string work; anything
+    else falls back to parse_raw_type().
+    """
+    return {**type_map, **{name.upper(): col_type for name, col_type in type_map.items()}}
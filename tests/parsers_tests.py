@@ -4,21 +4,32 @@ Unit tests for document parsers (JSON file reader) and STRUCT type inference.
 Run: conda run -n shelfard python3 tests/parsers_tests.py
 """
 
+import atexit
 import json
+import shutil
 import sys
 import tempfile
 import traceback
+import uuid
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+try:
+    import orjson
+    _encode = orjson.dumps
+except ImportError:   # optional speedup; see the "speedups" extra
+    def _encode(obj):
+        return json.dumps(obj).encode()
+
 from shelfard import (
     ColumnSchema, TableSchema, ColumnType,
     LocalFileRegistry,
     get_registered_schema,
-    infer_schema_from_json_file, read_and_register_json_file,
+    infer_schema_from_json_file, infer_schema_from_json_bytes, read_and_register_json_file,
     compare_schemas,
 )
+from shelfard._json import JSONDecodeError, loads_head
 from shelfard.models import ChangeType, ChangeSeverity
 import shelfard.registry as registry
 
@@ -51,6 +62,21 @@ def section(name):
     print(f"\n── {name} ──")
 
 
+# ─────────────────────────────────────────────
+# Scratch directories
+# ─────────────────────────────────────────────
+
+_BASE_TMP = Path(tempfile.mkdtemp(prefix="shelfard_tests_"))
+atexit.register(shutil.rmtree, _BASE_TMP, ignore_errors=True)
+
+
+def _scratch_dir():
+    """Return a fresh, empty subdirectory of the module-wide scratch root."""
+    path = _BASE_TMP / uuid.uuid4().hex
+    path.mkdir()
+    return path
+
+
 # ─────────────────────────────────────────────
 # JSON File Reader
 # ─────────────────────────────────────────────
@@ -59,98 +85,130 @@ section("JSON File Reader")
 
 
 def test_basic_type_inference():
-    with tempfile.TemporaryDirectory() as tmp:
-        path = f"{tmp}/payload.json"
-        with open(path, "w") as f:
-            json.dump({
-                "count": 42,
-                "ratio": 3.14,
-                "active": True,
-                "label": "hello",
-                "tags": ["a", "b"],
-                "meta": {"k": "v"},
-                "deleted_at": None,
-            }, f)
-        result = infer_schema_from_json_file(path, "payload")
-        assert result.success, result.error
-        cols = {c["name"]: c for c in result.data["schema"]["columns"]}
-        assert cols["count"]["col_type"]      == ColumnType.INTEGER
-        assert cols["ratio"]["col_type"]      == ColumnType.FLOAT
-        assert cols["active"]["col_type"]     == ColumnType.BOOLEAN
-        assert cols["label"]["col_type"]      == ColumnType.VARCHAR
-        assert cols["tags"]["col_type"]       == ColumnType.ARRAY
-        assert cols["meta"]["col_type"]       == ColumnType.STRUCT
-        assert cols["deleted_at"]["col_type"] == ColumnType.UNKNOWN
+    result = infer_schema_from_json_bytes(_encode({
+        "count": 42,
+        "ratio": 3.14,
+        "active": True,
+        "label": "hello",
+        "tags": ["a", "b"],
+        "meta": {"k": "v"},
+        "deleted_at": None,
+    }), "payload")
+    assert result.success, result.error
+    cols = {c["name"]: c for c in result.data["schema"]["columns"]}
+    assert cols["count"]["col_type"]      == ColumnType.INTEGER
+    assert cols["ratio"]["col_type"]      == ColumnType.FLOAT
+    assert cols["active"]["col_type"]     == ColumnType.BOOLEAN
+    assert cols["label"]["col_type"]      == ColumnType.VARCHAR
+    assert cols["tags"]["col_type"]       == ColumnType.ARRAY
+    assert cols["meta"]["col_type"]       == ColumnType.STRUCT
+    assert cols["deleted_at"]["col_type"] == ColumnType.UNKNOWN
 
 test("basic type inference (int/float/bool/str/list/dict/null)", test_basic_type_inference)
 
 
 def test_datetime_string_detection():
-    with tempfile.TemporaryDirectory() as tmp:
-        path = f"{tmp}/ts.json"
-        with open(path, "w") as f:
-            json.dump({"created_at": "2024-01-15T10:30:00"}, f)
-        result = infer_schema_from_json_file(path, "ts")
-        assert result.success, result.error
-        col = result.data["schema"]["columns"][0]
-        assert col["col_type"] == ColumnType.TIMESTAMP
+    result = infer_schema_from_json_bytes(_encode({"created_at": "2024-01-15T10:30:00"}), "ts")
+    assert result.success, result.error
+    col = result.data["schema"]["columns"][0]
+    assert col["col_type"] == ColumnType.TIMESTAMP
 
 test("datetime string → TIMESTAMP", test_datetime_string_detection)
 
 
 def test_date_string_detection():
-    with tempfile.TemporaryDirectory() as tmp:
-        path = f"{tmp}/dt.json"
-        with open(path, "w") as f:
-            json.dump({"birth_date": "2024-01-15"}, f)
-        result = infer_schema_from_json_file(path, "dt")
-        assert result.success, result.error
-        col = result.data["schema"]["columns"][0]
-        assert col["col_type"] == ColumnType.DATE
+    result = infer_schema_from_json_bytes(_encode({"birth_date": "2024-01-15"}), "dt")
+    assert result.success, result.error
+    col = result.data["schema"]["columns"][0]
+    assert col["col_type"] == ColumnType.DATE
 
 test("date string → DATE", test_date_string_detection)
 
 
 def test_nullable_inference():
-    with tempfile.TemporaryDirectory() as tmp:
-        path = f"{tmp}/null.json"
-        with open(path, "w") as f:
-            json.dump({"present": "value", "absent": None}, f)
-        result = infer_schema_from_json_file(path, "null")
-        assert result.success, result.error
-        cols = {c["name"]: c for c in result.data["schema"]["columns"]}
-        assert cols["present"]["nullable"] == False
-        assert cols["absent"]["nullable"]  == True
+    result = infer_schema_from_json_bytes(_encode({"present": "value", "absent": None}), "null")
+    assert result.success, result.error
+    cols = {c["name"]: c for c in result.data["schema"]["columns"]}
+    assert cols["present"]["nullable"] == False
+    assert cols["absent"]["nullable"]  == True
 
 test("null field → nullable=True, non-null → nullable=False", test_nullable_inference)
 
 
 def test_bool_before_int():
-    with tempfile.TemporaryDirectory() as tmp:
-        path = f"{tmp}/bool.json"
-        with open(path, "w") as f:
-            json.dump({"flag_true": True, "flag_false": False}, f)
-        result = infer_schema_from_json_file(path, "bool")
-        assert result.success, result.error
-        cols = {c["name"]: c for c in result.data["schema"]["columns"]}
-        assert cols["flag_true"]["col_type"]  == ColumnType.BOOLEAN
-        assert cols["flag_false"]["col_type"] == ColumnType.BOOLEAN
+    result = infer_schema_from_json_bytes(_encode({"flag_true": True, "flag_false": False}), "bool")
+    assert result.success, result.error
+    cols = {c["name"]: c for c in result.data["schema"]["columns"]}
+    assert cols["flag_true"]["col_type"]  == ColumnType.BOOLEAN
+    assert cols["flag_false"]["col_type"] == ColumnType.BOOLEAN
 
 test("bool values → BOOLEAN (not INTEGER)", test_bool_before_int)
 
 
 def test_root_level_array():
-    with tempfile.TemporaryDirectory() as tmp:
-        path = f"{tmp}/arr.json"
-        with open(path, "w") as f:
-            json.dump([{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob"}], f)
-        result = infer_schema_from_json_file(path, "arr")
-        assert result.success, result.error
-        cols = {c["name"]: c for c in result.data["schema"]["columns"]}
-        assert cols["id"]["col_type"]   == ColumnType.INTEGER
-        assert cols["name"]["col_type"] == ColumnType.VARCHAR
+    payload = [{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob", "email": "bob@x.io"}]
+    result = infer_schema_from_json_bytes(_encode(payload), "arr")
+    assert result.success, result.error
+    cols = {c["name"]: c for c in result.data["schema"]["columns"]}
+    assert cols["id"]["col_type"]    == ColumnType.INTEGER
+    assert cols["name"]["col_type"]  == ColumnType.VARCHAR
+    assert cols["email"]["col_type"] == ColumnType.VARCHAR
+    assert cols["email"]["nullable"] == True                        # only in the second record
+
+test("root-level array → schema covers fields from later records", test_root_level_array)
+
+
+def test_root_level_array_tail_not_decoded():
+    # Only the sampled records are decoded; the remainder of the array is never scanned.
+    result = infer_schema_from_json_bytes(b' [ {"id": 1}, <not json> ', "arr", sample_size=1)
+    assert result.success, result.error
+    assert [c["name"] for c in result.data["schema"]["columns"]] == ["id"]
+
+    empty = infer_schema_from_json_bytes(b"[ ]", "arr")
+    assert not empty.success
+    assert "empty" in empty.error.lower()
+
+test("root-level array → tail beyond the sample is not decoded", test_root_level_array_tail_not_decoded)
+
+
+def test_root_level_array_truncated():
+    # At end of body the closing ']' is required, however few records are sampled.
+    for payload, n in [(b'[{"a": 1}', 1), (b'[{"a": 1}, {"a": 2}', 2), (b'[{"a": 1}', 16)]:
+        try:
+            loads_head(payload, n)
+            assert False, f"truncated {payload!r} decoded with n={n}"
+        except JSONDecodeError:
+            pass
+    result = infer_schema_from_json_bytes(b'[{"a": 1}', "arr", sample_size=1)
+    assert not result.success
+    assert "invalid json" in result.error.lower()
 
-test("root-level array → uses first element", test_root_level_array)
+test("root-level array → body cut off after the sample is rejected", test_root_level_array_truncated)
+
+
+def test_root_level_array_sample_union():
+    payload = [
+        {"id": 1, "score": 3,   "tags": {"a": 1}},
+        {"id": 2, "score": 4.5, "tags": None, "nickname": "bo"},
+        {"id": 3, "score": 7,   "tags": {"a": 2, "b": "x"}},
+    ]
+    result = infer_schema_from_json_bytes(_encode(payload), "arr")
+    assert result.success, result.error
+    cols = {c["name"]: c for c in result.data["schema"]["columns"]}
+    assert list(cols) == ["id", "score", "tags", "nickname"]
+    assert cols["id"]["nullable"]          == False
+    assert cols["score"]["col_type"]       == ColumnType.FLOAT      # INTEGER + FLOAT
+    assert cols["tags"]["col_type"]        == ColumnType.STRUCT
+    assert cols["tags"]["nullable"]        == True                  # null in one sample
+    fields = {f["name"]: f for f in cols["tags"]["fields"]}
+    assert fields["a"]["nullable"]         == False
+    assert fields["b"]["nullable"]         == True                  # missing in one sample
+    assert cols["nickname"]["nullable"]    == True                  # missing in two samples
+
+    first_only = infer_schema_from_json_bytes(_encode(payload), "arr", sample_size=1)
+    assert [c["name"] for c in first_only.data["schema"]["columns"]] == ["id", "score", "tags"]
+
+test("root-level array → first sample_size records merged into one schema", test_root_level_array_sample_union)
 
 
 def test_file_not_found():
@@ -161,27 +219,35 @@ def test_file_not_found():
 test("file not found → ToolResult(success=False)", test_file_not_found)
 
 
+def test_invalid_json_bytes():
+    result = infer_schema_from_json_bytes(b'{"id": 1,', "broken")
+    assert not result.success
+    assert "invalid json" in result.error.lower()
+
+test("invalid JSON bytes → ToolResult(success=False)", test_invalid_json_bytes)
+
+
 def test_read_and_register():
-    with tempfile.TemporaryDirectory() as tmp:
-        registry._default._root = Path(tmp)
-        path = f"{tmp}/api_response.json"
-        with open(path, "w") as f:
-            json.dump({
-                "user_id": 99,
-                "email": "user@example.com",
-                "verified": True,
-                "created_at": "2024-03-01T12:00:00",
-            }, f)
-        reg_result = read_and_register_json_file(path, "api_response")
-        assert reg_result.success, reg_result.error
-
-        get_result = get_registered_schema("api_response")
-        assert get_result.success
-        cols = {c["name"]: c for c in get_result.data["schema"]["columns"]}
-        assert cols["user_id"]["col_type"]    == ColumnType.INTEGER
-        assert cols["email"]["col_type"]      == ColumnType.VARCHAR
-        assert cols["verified"]["col_type"]   == ColumnType.BOOLEAN
-        assert cols["created_at"]["col_type"] == ColumnType.TIMESTAMP
+    tmp = _scratch_dir()
+    registry._default._root = Path(tmp)
+    path = f"{tmp}/api_response.json"
+    with open(path, "wb") as f:
+        f.write(_encode({
+            "user_id": 99,
+            "email": "user@example.com",
+            "verified": True,
+            "created_at": "2024-03-01T12:00:00",
+        }))
+    reg_result = read_and_register_json_file(path, "api_response")
+    assert reg_result.success, reg_result.error
+
+    get_result = get_registered_schema("api_response")
+    assert get_result.success
+    cols = {c["name"]: c for c in get_result.data["schema"]["columns"]}
+    assert cols["user_id"]["col_type"]    == ColumnType.INTEGER
+    assert cols["email"]["col_type"]      == ColumnType.VARCHAR
+    assert cols["verified"]["col_type"]   == ColumnType.BOOLEAN
+    assert cols["created_at"]["col_type"] == ColumnType.TIMESTAMP
 
 test("end-to-end: read JSON file + register + retrieve from registry", test_read_and_register)
 
@@ -194,76 +260,64 @@ section("STRUCT Type — Nested Schema")
 
 
 def test_nested_object_becomes_struct():
-    with tempfile.TemporaryDirectory() as tmp:
-        path = f"{tmp}/nested.json"
-        with open(path, "w") as f:
-            json.dump({"user": {"id": 1, "name": "Alice"}}, f)
-        result = infer_schema_from_json_file(path, "nested")
-        assert result.success, result.error
-        cols = {c["name"]: c for c in result.data["schema"]["columns"]}
-        assert cols["user"]["col_type"] == ColumnType.STRUCT
-        fields = {f["name"]: f for f in cols["user"]["fields"]}
-        assert fields["id"]["col_type"]   == ColumnType.INTEGER
-        assert fields["name"]["col_type"] == ColumnType.VARCHAR
+    result = infer_schema_from_json_bytes(_encode({"user": {"id": 1, "name": "Alice"}}), "nested")
+    assert result.success, result.error
+    cols = {c["name"]: c for c in result.data["schema"]["columns"]}
+    assert cols["user"]["col_type"] == ColumnType.STRUCT
+    fields = {f["name"]: f for f in cols["user"]["fields"]}
+    assert fields["id"]["col_type"]   == ColumnType.INTEGER
+    assert fields["name"]["col_type"] == ColumnType.VARCHAR
 
 test("nested dict → STRUCT with correct child fields", test_nested_object_becomes_struct)
 
 
 def test_deep_nesting():
-    with tempfile.TemporaryDirectory() as tmp:
-        path = f"{tmp}/deep.json"
-        with open(path, "w") as f:
-            json.dump({"a": {"b": {"c": 42}}}, f)
-        result = infer_schema_from_json_file(path, "deep")
-        assert result.success, result.error
-        top = result.data["schema"]["columns"][0]
-        assert top["col_type"] == ColumnType.STRUCT
-        mid = top["fields"][0]
-        assert mid["col_type"] == ColumnType.STRUCT
-        leaf = mid["fields"][0]
-        assert leaf["col_type"] == ColumnType.INTEGER
+    result = infer_schema_from_json_bytes(_encode({"a": {"b": {"c": 42}}}), "deep")
+    assert result.success, result.error
+    top = result.data["schema"]["columns"][0]
+    assert top["col_type"] == ColumnType.STRUCT
+    mid = top["fields"][0]
+    assert mid["col_type"] == ColumnType.STRUCT
+    leaf = mid["fields"][0]
+    assert leaf["col_type"] == ColumnType.INTEGER
 
 test("3-level deep nesting → STRUCT → STRUCT → INTEGER", test_deep_nesting)
 
 
 def test_struct_field_types():
-    with tempfile.TemporaryDirectory() as tmp:
-        path = f"{tmp}/mixed.json"
-        with open(path, "w") as f:
-            json.dump({"address": {
-                "street": "Main St",
-                "number": 42,
-                "active": True,
-                "note": None,
-            }}, f)
-        result = infer_schema_from_json_file(path, "mixed")
-        assert result.success, result.error
-        struct_col = result.data["schema"]["columns"][0]
-        fields = {f["name"]: f for f in struct_col["fields"]}
-        assert fields["street"]["col_type"] == ColumnType.VARCHAR
-        assert fields["number"]["col_type"] == ColumnType.INTEGER
-        assert fields["active"]["col_type"] == ColumnType.BOOLEAN
-        assert fields["note"]["col_type"]   == ColumnType.UNKNOWN
-        assert fields["note"]["nullable"]   == True
+    result = infer_schema_from_json_bytes(_encode({"address": {
+        "street": "Main St",
+        "number": 42,
+        "active": True,
+        "note": None,
+    }}), "mixed")
+    assert result.success, result.error
+    struct_col = result.data["schema"]["columns"][0]
+    fields = {f["name"]: f for f in struct_col["fields"]}
+    assert fields["street"]["col_type"] == ColumnType.VARCHAR
+    assert fields["number"]["col_type"] == ColumnType.INTEGER
+    assert fields["active"]["col_type"] == ColumnType.BOOLEAN
+    assert fields["note"]["col_type"]   == ColumnType.UNKNOWN
+    assert fields["note"]["nullable"]   == True
 
 test("mixed types inside STRUCT fields inferred correctly", test_struct_field_types)
 
 
 def test_struct_roundtrip():
-    with tempfile.TemporaryDirectory() as tmp:
-        registry._default._root = Path(tmp)
-        path = f"{tmp}/event.json"
-        with open(path, "w") as f:
-            json.dump({"payload": {"event_type": "click", "value": 1}}, f)
-        assert read_and_register_json_file(path, "event").success
-
-        get_result = get_registered_schema("event")
-        assert get_result.success
-        cols = {c["name"]: c for c in get_result.data["schema"]["columns"]}
-        assert cols["payload"]["col_type"] == ColumnType.STRUCT
-        fields = {f["name"]: f for f in cols["payload"]["fields"]}
-        assert fields["event_type"]["col_type"] == ColumnType.VARCHAR
-        assert fields["value"]["col_type"]      == ColumnType.INTEGER
+    tmp = _scratch_dir()
+    registry._default._root = Path(tmp)
+    path = f"{tmp}/event.json"
+    with open(path, "wb") as f:
+        f.write(_encode({"payload": {"event_type": "click", "value": 1}}))
+    assert read_and_register_json_file(path, "event").success
+
+    get_result = get_registered_schema("event")
+    assert get_result.success
+    cols = {c["name"]: c for c in get_result.data["schema"]["columns"]}
+    assert cols["payload"]["col_type"] == ColumnType.STRUCT
+    fields = {f["name"]: f for f in cols["payload"]["fields"]}
+    assert fields["event_type"]["col_type"] == ColumnType.VARCHAR
+    assert fields["value"]["col_type"]      == ColumnType.INTEGER
 
 test("STRUCT round-trip: infer → register → retrieve → fields preserved", test_struct_roundtrip)
 
@@ -1,16 +1,17 @@
 """
 Integration tests for RestEndpointReader.
 
-Uses a local mock HTTP server (stdlib http.server + socketserver) so no real
+Uses a local mock HTTP server (stdlib http.server.ThreadingHTTPServer) so no real
 network is needed. Each test starts its own server on a random OS-assigned port
 and shuts it down in a finally block.
 
 Run: conda run -n shelfard python3 tests/rest_tests.py
 """
 
+import asyncio
+import http.client
 import http.server
 import json
-import socketserver
 import sys
 import threading
 import traceback
@@ -19,7 +20,9 @@ from pathlib import Path
 # Make the project root importable
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from shelfard import ColumnType, RestEndpointReader, get_rest_schema
+from shelfard import ColumnType, RestEndpointReader, get_rest_schema, get_rest_schemas
+from shelfard._json import loads_head_iter
+from shelfard.tools.rest.reader import _CHUNK_SIZE, _SESSION
 
 # ─────────────────────────────────────────────
 # Minimal test framework (mirrors run_tests.py)
@@ -70,20 +73,24 @@ def make_mock_server(response_body, *, status: int = 200, content_type: str = "a
     )
 
     class Handler(http.server.BaseHTTPRequestHandler):
-        last_headers: dict = {}
+        protocol_version = "HTTP/1.1"
+        last_headers = http.client.HTTPMessage()
 
         def do_GET(self):
-            Handler.last_headers = dict(self.headers)
+            Handler.last_headers = self.headers   # HTTPMessage: case-insensitive .get()
             self.send_response(status)
             self.send_header("Content-Type", content_type)
             self.send_header("Content-Length", str(len(body_bytes)))
+            self.send_header("Connection", "close")
             self.end_headers()
             self.wfile.write(body_bytes)
 
         def log_message(self, *args):
             pass  # suppress server output during tests
 
-    httpd = socketserver.TCPServer(("127.0.0.1", 0), Handler)
+    # ThreadingHTTPServer uses daemon handler threads and SO_REUSEADDR, so
+    # shutdown() returns without joining in-flight handlers.
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
     port = httpd.server_address[1]
     thread = threading.Thread(target=httpd.serve_forever)
     thread.daemon = True
@@ -165,6 +172,57 @@ def test_array_response_uses_first_element():
 test("array response → schema inferred from first element", test_array_response_uses_first_element)
 
 
+def test_array_records_larger_than_chunk():
+    # Each record spans several streamed chunks, so decoding has to resume
+    # mid-element; the extra field in a later sampled record must survive it.
+    blob = "x" * (3 * _CHUNK_SIZE)
+    records = [{"id": i, "blob": blob} for i in range(4)]
+    records[2]["note"] = "late"
+    httpd, port, _ = make_mock_server(records)
+    try:
+        result = RestEndpointReader(
+            f"http://127.0.0.1:{port}/big", "big", sample_size=3
+        ).get_schema()
+        assert result.success, result.error
+        cols = {c["name"]: c for c in result.data["schema"]["columns"]}
+        assert cols["id"]["col_type"]   == ColumnType.INTEGER
+        assert cols["blob"]["col_type"] == ColumnType.VARCHAR
+        assert cols["note"]["nullable"] is True
+    finally:
+        httpd.shutdown()
+
+
+test("array records larger than a stream chunk are sampled intact", test_array_records_larger_than_chunk)
+
+
+def test_object_body_with_character_split_across_chunks():
+    # Pad so a two-byte "я" starts on the last byte of the first streamed chunk.
+    head = b'{"id": 1, "desc": "'
+    pad = b"x" * ((_CHUNK_SIZE - 1 - len(head)) % 2)
+    body = head + pad + "я".encode() * 40000 + b'"}'
+    assert body[_CHUNK_SIZE - 1:_CHUNK_SIZE + 1] == "я".encode()
+    httpd, port, _ = make_mock_server(body)
+    try:
+        result = RestEndpointReader(f"http://127.0.0.1:{port}/obj", "obj").get_schema()
+        assert result.success, result.error
+        cols = {c["name"]: c for c in result.data["schema"]["columns"]}
+        assert cols["desc"]["col_type"] == ColumnType.VARCHAR
+    finally:
+        httpd.shutdown()
+
+
+test("object body larger than a stream chunk with a split character decodes", test_object_body_with_character_split_across_chunks)
+
+
+def test_loads_head_iter_split_character():
+    ya = "я".encode()
+    assert loads_head_iter([b'{"d": "' + ya[:1], ya[1:] + b'"}']) == {"d": "я"}
+    assert loads_head_iter([b'[{"d": "' + ya[:1], ya[1:] + b'"}]']) == [{"d": "я"}]
+
+
+test("loads_head_iter() → character split across chunks, object and array bodies", test_loads_head_iter_split_character)
+
+
 def test_non_200_returns_error():
     httpd, port, _ = make_mock_server({"detail": "not found"}, status=404)
     try:
@@ -194,6 +252,46 @@ def test_non_json_response_returns_error():
 test("non-JSON response → success=False mentioning JSON", test_non_json_response_returns_error)
 
 
+def test_context_manager_closes_and_reader_stays_usable():
+    httpd, port, _ = make_mock_server({"id": 1})
+    try:
+        with RestEndpointReader(f"http://127.0.0.1:{port}/items", "items") as reader:
+            assert reader.get_schema().success
+        # The shared session is not the reader's to close: its pool survives.
+        assert reader._session is _SESSION
+        assert _SESSION.adapters["http://"].poolmanager.pools
+        result = reader.get_schema()
+        assert result.success, result.error
+    finally:
+        httpd.shutdown()
+
+
+test("context manager leaves the shared session open and the reader usable", test_context_manager_closes_and_reader_stays_usable)
+
+
+def test_batch_and_async_fetch():
+    users, users_port, _ = make_mock_server({"id": 1, "email": "a@b.com"})
+    missing, missing_port, _ = make_mock_server({"detail": "not found"}, status=404)
+    try:
+        results = get_rest_schemas([
+            (f"http://127.0.0.1:{users_port}/users", "users"),
+            (f"http://127.0.0.1:{missing_port}/missing", "missing"),
+        ])
+        assert [r.success for r in results] == [True, False]
+        assert results[0].data["schema"]["table_name"] == "users"
+        assert "404" in results[1].error
+
+        reader = RestEndpointReader(f"http://127.0.0.1:{users_port}/users", "users")
+        result = asyncio.run(reader.get_schema_async())
+        assert result.success, result.error
+    finally:
+        users.shutdown()
+        missing.shutdown()
+
+
+test("get_rest_schemas() fetches concurrently in input order; get_schema_async() awaits", test_batch_and_async_fetch)
+
+
 def test_list_tables_not_supported():
     reader = RestEndpointReader("http://example.com/api/users", "users")
     result = reader.list_tables()